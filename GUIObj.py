@@ -1,119 +1,12 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 import colors
-
-
-class Event:
-    def __init__(self, caller):
-        self.caller = caller
-
-
-class SelectEvent:
-    def __init__(self, caller, multiselect):
-        self.caller = caller
-        self.multiselect = multiselect
-
-
-class Vector:
-    """Represents a position in 2d space"""
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
-
-    def __str__(self):
-        return "Vector: %f, %f" % (self.x, self.y)
-
-    def __add__(self, other):
-        return Vector(self.x + other.x, self.y + other.y)
-
-
-class Sized:
-    """Represents an object with a size"""
-    def __init__(self, size=Vector(0, 0), **kwargs):
-        super().__init__(**kwargs)
-        self.size = size
-
-
-class GUIObj:
-    """Represents the most basic gui object"""
-    def __init__(self, name="", class_variable=False, **kwargs):
-        # What is class_variable? Wether or not it is a global maybe?
-        self.name = name
-        self.class_variable = class_variable
-        self._events = {}
-
-    def bind_event(self, event, action):
-        """Binds the action to the event."""
-        # This is my way of doing callbacks/bindings/events. I looked up on
-        # google for python event and it seems there is not built in event
-        # code. So this is a quick and basic way to do it. Store actions for an
-        # event as a list in a dict, where the event is the key
-        actions = self._events.get(event, [])
-        if action not in actions:
-            actions += [action]
-        self._events[event] = actions
-
-
-class Container(GUIObj):
-    """A gui obj that can contain Widgets"""
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.__children = set()
-
-    def add_child(self, child):
-        """Add the given child Widget"""
-        self.__children.add(child)
-
-    def remove_child(self, child):
-        """Removes the given child widget"""
-        self.__children.remove(child)
-
-    def children(self):
-        """Returns a list of current children"""
-        return list(self.__children)
-
-
-class Window(Container, Sized):
-    """Represents a window on the screen. Is a Container for other widgets"""
-    def __init__(self, title="", size=Vector(600, 800), **kwargs):
-        super().__init__(**kwargs)
-        self.title = title
-        self.size = size
-
-    @property
-    def name(self):
-        return "root"
-        
-    @name.setter
-    def name(self, value):
-        pass # don't set name.
-        # Todo: Make this error so we can see where name setting logic is wrong
-
-
-
-class Widget(GUIObj):
-    """Represents all tk widgets. Must be a child of a container."""
-    def __init__(self, parent=None, **kwargs):
-        super().__init__(**kwargs)
-        self.parent = parent
-        self.parent.add_child(self)
-
-
-class MovableWidget(Widget):
-    """A Widget that has a position"""
-    def __init__(self, position=Vector(0, 0), **kwargs):
-        super().__init__(**kwargs)
-        self.position = position
-
-
-class SizableWidget(Widget):
-    """
-    A Widget that has a size
-    Must implement resized event
-    """
-    def __init__(self, size=Vector(0, 0), **kwargs):
-        super().__init__(size=size, **kwargs)
-        self.size = size
+# The model classes live in guimodel so they can be used without tk. They are
+# imported here so GUIObj.Button and the others keep working
+from guimodel import (Event, SelectEvent, MoveEvent, DragEvent, Vector, Sized,
+                      GUIObj, Container, Window, Widget, MovableWidget,
+                      SizableWidget, Font, TextContainer, Frame, Button,
+                      Label, Canvas, Checkbutton, Entry, Text)
 
 
 class TkWidgetImpl(Widget):
@@ -175,8 +68,10 @@ class TkWidgetImpl(Widget):
                                                      height=0)
         # the view id is used to keep track of everything INCLUDING the window
         # canvas on the main canvas
+        # the tag is given to everything this widget puts on the main canvas
+        self.tag = "guiobj%d" % id(self)
         self.view_id = self.canvas.create_window(0, 0, window=self.window,
-                                                 anchor=tk.NW)
+                                                 anchor=tk.NW, tags=self.tag)
         self._selected = False
         # bind the widget and move it to the front
         self.outline.bind("<Button-1>", self.__select, add="+")
@@ -202,11 +97,17 @@ class TkWidgetImpl(Widget):
         self.window.itemconfig(self.__widget_id, height=event.height)
 
     def __multiselect(self, event):
+        self.multiselect()
+
+    def multiselect(self, notify=True):
+        """
+        selects this widget without unselecting the other widgets. The
+        selected event is only emitted if notify is True
+        """
         self._selected = True
         self.window.itemconfig(self.__outline_id, state=tk.NORMAL)
-        if "selected" in self._events:
-            for event in self._events["selected"]:
-                event(SelectEvent(self, True))
+        if notify and "selected" in self._events:
+            self._events.emit("selected", SelectEvent(self, True))
 
     def __select(self, event):
         self.selected = True
@@ -223,11 +124,9 @@ class TkWidgetImpl(Widget):
                                state=tk.NORMAL if value else tk.HIDDEN)
         # callback
         if value and "selected" in self._events:
-            for event in self._events["selected"]:
-                event(SelectEvent(self, False))
+            self._events.emit("selected", SelectEvent(self, False))
         if not value and "unselected" in self._events:
-            for event in self._events["unselected"]:
-                event(SelectEvent(self, False))
+            self._events.emit("unselected", SelectEvent(self, False))
 
 
 class TkMovableWidgetImpl(MovableWidget, TkWidgetImpl):
@@ -241,7 +140,9 @@ class TkMovableWidgetImpl(MovableWidget, TkWidgetImpl):
     with a Vector parameter representing the delta moved
 
     By inheriting from this class <B1-Motion> is bound on the widget to
-    implement dragging.
+    implement dragging. If anything is bound to the "dragged" event, the
+    event is fired with the position the widget was dragged to instead of
+    moving the widget, so the drag can be handled elsewhere.
     """
     def __init__(self, position=Vector(0, 0), **kwargs):
         self.__maxpos = Vector(0, 0)
@@ -263,18 +164,18 @@ class TkMovableWidgetImpl(MovableWidget, TkWidgetImpl):
         """
         # event.x and event.y is the position of the mouse relative to the
         # widget.This is essentially the delta
-        new_pos = Vector(0, 0)
-        new_pos.x = event.x_root - self.__click_offset.x
-        new_pos.y = event.y_root - self.__click_offset.y
+        new_pos = Vector(event.x_root, event.y_root) - self.__click_offset
 
-        self.position = new_pos
+        if "dragged" in self._events:
+            self._events.emit("dragged", DragEvent(self, new_pos))
+        else:
+            self.position = new_pos
 
     def __click(self, event):
         """
         Called from the widget being clicked on
         """
-        self.__click_offset = Vector(event.x_root - self.position.x,
-                                     event.y_root - self.position.y)
+        self.__click_offset = Vector(event.x_root, event.y_root) - self.position
 
     def __recalc_maxpos(self, event=None, position=None):
         """
@@ -290,20 +191,19 @@ class TkMovableWidgetImpl(MovableWidget, TkWidgetImpl):
 
         self.__maxpos = Vector(max_x, max_y)
         if position is None:
-            new_position = Vector(self.position.x, self.position.y)
-            if new_position.x > max_x:
-                new_position.x = max_x
-            if new_position.y > max_y:
-                new_position.y = max_y
-            self.position = new_position
-            self.position = self.position
-        else:
-            new_position = Vector(position.x, position.y)
-            if new_position.x > max_x:
-                new_position.x = max_x
-            if new_position.y > max_y:
-                new_position.y = max_y
-            self.position = new_position
+            position = self.position
+        # the position setter keeps the position inside of the max position
+        self.position = position
+
+    def shift_position(self, delta):
+        """
+        Records a move by the delta that was already done on the canvas, for
+        example by moving a tag of several widgets at once
+        """
+        self._position = self._position + delta
+        # callback
+        if "moved" in self._events:
+            self._events.emit("moved", MoveEvent(self, delta))
 
     @property
     def position(self):
@@ -313,28 +213,16 @@ class TkMovableWidgetImpl(MovableWidget, TkWidgetImpl):
     def position(self, value):
         # Check to make sure we are not moving outside of bounds
         # This check might not work if the parent does not have a size
-        if value.x > self.__maxpos.x:
-            value.x = self.__maxpos.x
-        if value.y > self.__maxpos.y:
-            value.y = self.__maxpos.y
-        if value.x < 0:
-            value.x = 0
-        if value.y < 0:
-            value.y = 0
+        value = value.clamp((0, 0), self.__maxpos)
 
         # calculate the delta and move the view_id by the delta
-        delta_x = value.x - self.position.x
-        delta_y = value.y - self.position.y
+        delta = value - self.position
 
-        self.canvas.move(self.view_id, delta_x, delta_y)
+        self.canvas.move(self.view_id, delta.x, delta.y)
         self._position = value
         # callback
         if "moved" in self._events:
-            delta = Vector(delta_x, delta_y)
-            for event in self._events["moved"]:
-                new_event = Event(self)
-                new_event.delta = delta
-                event(new_event)
+            self._events.emit("moved", MoveEvent(self, delta))
 
 
 class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
@@ -381,9 +269,7 @@ class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
 
         # callback
         if "resized" in self._events:
-            for event in self._events["resized"]:
-                new_event = Event(self)
-                event(new_event)
+            self._events.emit("resized", Event(self))
 
     def __show_handle(self, event=None):
         self.window.itemconfig(self.__handle_id, state=tk.NORMAL)
@@ -395,9 +281,7 @@ class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
         """
         The handle was dragged and this widget needs to be resized by the delta
         """
-        new_size = Vector(0, 0)
-        new_size.x = event.x_root - self.__click_offset.x
-        new_size.y = event.y_root - self.__click_offset.y
+        new_size = Vector(event.x_root, event.y_root) - self.__click_offset
         new_size = self._clamp_size(new_size)
         self.size = new_size
 
@@ -405,20 +289,15 @@ class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
         """
         The handle was clicked. Set up to be dragged
         """
-        self.__click_offset = Vector(event.x_root - self.size.x,
-                                     event.y_root - self.size.y)
+        self.__click_offset = Vector(event.x_root, event.y_root) - self.size
 
     def _clamp_size(self, size):
         """
         Clamps a vector size so that it does not go out of bounds of the parent
         """
-        new_size = Vector(size.x, size.y)
         if isinstance(self, MovableWidget) and isinstance(self.parent, Sized):
-            if new_size.x + self.position.x > self.parent.size.x:
-                new_size.x = self.parent.size.x - self.position.x
-            if new_size.y + self.position.y > self.parent.size.y:
-                new_size.y = self.parent.size.y - self.position.y
-        return new_size
+            return size.clamp(high=self.parent.size - self.position)
+        return size
 
     @property
     def size(self):
@@ -431,12 +310,9 @@ class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
     def size(self, value):
         if hasattr(self, '_size'):
             # clamp the size
-            if value.y < 10:
-                value.y = 10
-            if value.x < 10:
-                value.x = 10
+            value = value.clamp(low=(10, 10))
             # find the delta
-            delta = Vector(value.x - self.size.x, value.y - self.size.y)
+            delta = value - self.size
             # set the size
             self._size = value
             # resize the whole view
@@ -448,86 +324,11 @@ class TkSizableWidgetImpl(SizableWidget, TkWidgetImpl, Sized):
 
             # callback
             if "resized" in self._events:
-                for event in self._events["resized"]:
-                    new_event = Event(self)
-                    event(new_event)
+                self._events.emit("resized", Event(self))
         else:
             self._size = value
 
 
-class Font:
-    """Represents a font family"""
-    pass
-
-
-class TextContainer:
-    """Represents a widget that contains text"""
-    def __init__(self, text="", font=Font(), **kwargs):
-        super().__init__(**kwargs)
-        self.text = text
-        self.font = font
-
-
-class Frame(Container, MovableWidget, SizableWidget):
-    """Represents a tk.Frame"""
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-
-class Button(TextContainer, MovableWidget, SizableWidget):
-    def __init__(self, command="", **kwargs):
-        """
-        @type canvas: tk.Canvas
-        """
-        super().__init__(**kwargs)
-        self.command = command
-
-
-class Label(TextContainer, MovableWidget, SizableWidget):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-
-class Canvas(MovableWidget, SizableWidget):
-    def __init__(self, bg="white", **kwargs):
-        super().__init__(**kwargs)
-        self.bg = bg
-
-
-class Checkbutton(Label):
-    def __init__(self, command="", offvalue="", onvalue="", takefocus=True,
-                 variable="", size=Vector(90, 20), text="Checkbutton",
-                 **kwargs):
-        super().__init__(command=command, offvalue=offvalue, onvalue=onvalue,
-                         takefocus=takefocus, variable=variable, size=size,
-                         text=text, **kwargs)
-        self.command = command
-        self.offvalue = offvalue
-        self.onvalue = onvalue
-        self.takefocus = takefocus
-        self.variable = variable
-
-
-class Entry(TextContainer, MovableWidget, SizableWidget):
-    def __init__(self, justify="left", show="", validate="",
-                 validate_command="", associated_variable="",
-                 size=Vector(90, 20), **kwargs):
-        super().__init__(size=size, **kwargs)
-        self.justify = justify
-        # indicates what character to replace with for password fields
-        self.show = show
-        self.associated_variable = associated_variable
-        # when to validate
-        # http://infohost.nmt.edu/tcc/help/pubs/tkinter/web/entry-validation.html
-        self.validate = validate
-        self.validate_command = validate_command
-
-
-class Text(MovableWidget, SizableWidget):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-
 class TtkButtonImpl(Button, TkSizableWidgetImpl, TkMovableWidgetImpl):
     def __init__(self, canvas=None, text="Button", size=Vector(50, 40),
                  **kwargs):
@@ -634,7 +435,7 @@ class TtkEntryImpl(TkSizableWidgetImpl, TkMovableWidgetImpl, Entry):
         self.widget["show"] = value
 
 
-class TkTextImpl(TkSizableWidgetImpl, TkMovableWidgetImpl):
+class TkTextImpl(TkSizableWidgetImpl, TkMovableWidgetImpl, Text):
     def __init__(self, canvas=None, text="", size=Vector(200, 40), **kwargs):
         self._text = text
 
@@ -729,6 +530,9 @@ class WindowImpl(Window):
         self.widget.bind("<Control-1>", self.__select, add="+")
 
     def __select(self, event):
+        if event.widget is self.widget and self.widget.find_withtag(tk.CURRENT):
+            # the click was on a widget that is drawn as canvas items
+            return
         self.selected = True
 
     @property
@@ -745,11 +549,9 @@ class WindowImpl(Window):
             self.outline.configure(bg=colors.white_secondary)
         # callback
         if value and "selected" in self._events:
-            for event in self._events["selected"]:
-                event(SelectEvent(self, False))
+            self._events.emit("selected", SelectEvent(self, False))
         if not value and "unselected" in self._events:
-            for event in self._events["unselected"]:
-                event(SelectEvent(self, False))
+            self._events.emit("unselected", SelectEvent(self, False))
 
     @property
     def title(self):
@@ -774,3 +576,473 @@ class WindowImpl(Window):
             self.widget.configure(height=value.y, width=value.x)
         except:
             pass
+
+
+class TkItemWidgetImpl(MovableWidget, SizableWidget, Sized):
+    """
+    @type canvas: tk.Canvas
+
+    This is the lightweight widget implementation. Instead of a canvas, frames
+    and a real tk widget per widget, the widget is drawn as a few plain items
+    (a body rectangle and its text) on the parent's canvas. The real tk widget
+    is only created while the widget is selected, and is destroyed again when
+    it is unselected, so loading thousands of widgets does not create
+    thousands of tk windows.
+
+    Every item of the widget is tagged with the tag property, so the whole
+    widget can be moved with a single canvas.move.
+
+    This class implements the position and size properties, shift_position()
+    and the "moved", "dragged", "resized", "selected" and "unselected" events
+    like TkMovableWidgetImpl and TkSizableWidgetImpl.
+
+    Subclasses set the preview_* attributes to change how the widget is drawn,
+    and implement create_widget() and configure_widget() for the real widget.
+    Property setters should call refresh() after changing a value.
+    """
+    preview_fill = colors.white_primary  # None is the color of the canvas
+    preview_outline = colors.white_secondary
+    preview_anchor = tk.CENTER
+    preview_box = False  # draws a check box in front of the text
+    handle_size = 10
+
+    def __init__(self, parent=None, **kwargs):
+        self.canvas = parent.widget
+        self.tag = "guiobj%d" % id(self)
+        self.widget = None  # the real tk widget. Only exists while selected
+        self._position = Vector(0, 0)
+        self._size = Vector(0, 0)
+        self._selected = False
+        self.__widget_id = None
+        self.__click_offset = Vector(0, 0)
+
+        body_tags = (self.tag, self.tag + "body")
+        handle_tags = (self.tag, self.tag + "handle")
+        self.view_id = self.canvas.create_rectangle(0, 0, 0, 0, tags=body_tags)
+        self.__box_id = self.canvas.create_rectangle(
+            0, 0, 0, 0, tags=body_tags, fill="white",
+            outline=colors.darkblue_primary)
+        self.__text_id = self.canvas.create_text(0, 0, tags=body_tags,
+                                                 fill=colors.darkblue_primary)
+        self.__outline_id = self.canvas.create_rectangle(
+            0, 0, 0, 0, tags=self.tag, outline=colors.lightblue_primary,
+            width=2, state=tk.HIDDEN)
+        self.__handle_id = self.canvas.create_rectangle(
+            0, 0, 0, 0, tags=handle_tags, fill="white",
+            outline=colors.lightblue_primary, width=2, state=tk.HIDDEN)
+        super().__init__(parent=parent, **kwargs)
+
+        self.canvas.tag_bind(self.tag + "body", "<Button-1>", self.__select,
+                             add="+")
+        self.canvas.tag_bind(self.tag + "body", "<Control-1>",
+                             self.__multiselect, add="+")
+        self.canvas.tag_bind(self.tag + "body", "<B1-Motion>", self.__drag,
+                             add="+")
+        self.canvas.tag_bind(self.tag + "handle", "<Button-1>",
+                             self.__click_handle, add="+")
+        self.canvas.tag_bind(self.tag + "handle", "<B1-Motion>",
+                             self.__drag_handle, add="+")
+        self.bind_event("resized", self.__fit_parent)
+        self.parent.bind_event("resized", self.__fit_parent)
+        self.refresh()
+
+    def create_widget(self):
+        """returns a new real tk widget on the canvas"""
+        raise NotImplementedError
+
+    def configure_widget(self):
+        """copies the properties of this widget onto the real tk widget"""
+        pass
+
+    def preview_text(self):
+        """returns the text drawn on the preview"""
+        return ""
+
+    def delete(self):
+        """removes this object from the display"""
+        self.__destroy_widget()
+        self.canvas.delete(self.tag)
+
+    def refresh(self):
+        """redraws the preview and the real widget after a property changed"""
+        fill = self.preview_fill
+        if fill is None:
+            # filled with the canvas color so clicks inside still hit it
+            fill = self.canvas["background"]
+        self.canvas.itemconfig(self.view_id, fill=fill,
+                               outline=self.preview_outline)
+        self.canvas.itemconfig(self.__box_id,
+                               state=tk.NORMAL if self.preview_box
+                               else tk.HIDDEN)
+        self.canvas.itemconfig(self.__text_id, text=self.preview_text(),
+                               anchor=self.preview_anchor)
+        self.__layout()
+        if self.widget is not None:
+            self.configure_widget()
+
+    def __layout(self):
+        """places every item at the current position and size"""
+        x0 = self.position.x
+        y0 = self.position.y
+        x1 = x0 + self.size.x
+        y1 = y0 + self.size.y
+        self.canvas.coords(self.view_id, x0, y0, x1, y1)
+        self.canvas.coords(self.__outline_id, x0 - 2, y0 - 2, x1 + 2, y1 + 2)
+        self.canvas.coords(self.__handle_id, x1, y1, x1 + self.handle_size,
+                           y1 + self.handle_size)
+        text_x0 = x0 + 4
+        if self.preview_box:
+            box_y = (y0 + y1) / 2 - 6
+            self.canvas.coords(self.__box_id, x0 + 2, box_y, x0 + 14,
+                               box_y + 12)
+            text_x0 += 14
+        if self.preview_anchor == tk.NW:
+            self.canvas.coords(self.__text_id, text_x0, y0 + 4)
+        elif self.preview_anchor == tk.W:
+            self.canvas.coords(self.__text_id, text_x0, (y0 + y1) / 2)
+        elif self.preview_anchor == tk.E:
+            self.canvas.coords(self.__text_id, x1 - 4, (y0 + y1) / 2)
+        else:
+            self.canvas.coords(self.__text_id, (x0 + x1) / 2, (y0 + y1) / 2)
+        if self.__widget_id is not None:
+            self.canvas.coords(self.__widget_id, x0, y0)
+            self.canvas.itemconfig(self.__widget_id, width=self.size.x,
+                                   height=self.size.y)
+
+    def __create_widget(self):
+        """creates the real tk widget and places it over the preview"""
+        self.widget = self.create_widget()
+        self.widget["cursor"] = "arrow"
+        self.configure_widget()
+        self.__widget_id = self.canvas.create_window(
+            self.position.x, self.position.y, window=self.widget,
+            anchor=tk.NW, width=self.size.x, height=self.size.y,
+            tags=self.tag)
+        self.widget.bind("<Button-1>", self.__select, add="+")
+        self.widget.bind("<Control-1>", self.__multiselect, add="+")
+        self.widget.bind("<B1-Motion>", self.__drag, add="+")
+
+    def __destroy_widget(self):
+        if self.widget is not None:
+            self.canvas.delete(self.__widget_id)
+            self.widget.destroy()
+            self.widget = None
+            self.__widget_id = None
+
+    def __show_selected(self, value):
+        self._selected = value
+        state = tk.NORMAL if value else tk.HIDDEN
+        self.canvas.itemconfig(self.__outline_id, state=state)
+        self.canvas.itemconfig(self.__handle_id, state=state)
+        if value and self.widget is None:
+            self.__create_widget()
+        elif not value:
+            self.__destroy_widget()
+
+    def __select(self, event):
+        self.__click_offset = Vector(event.x_root, event.y_root) - self.position
+        self.selected = True
+
+    def __multiselect(self, event):
+        self.multiselect()
+
+    def multiselect(self, notify=True):
+        """
+        selects this widget without unselecting the other widgets. The
+        selected event is only emitted if notify is True
+        """
+        self.__show_selected(True)
+        if notify and "selected" in self._events:
+            self._events.emit("selected", SelectEvent(self, True))
+
+    def __drag(self, event):
+        new_pos = Vector(event.x_root, event.y_root) - self.__click_offset
+        if "dragged" in self._events:
+            self._events.emit("dragged", DragEvent(self, new_pos))
+        else:
+            self.position = new_pos
+
+    def __click_handle(self, event):
+        self.__click_offset = Vector(event.x_root, event.y_root) - self.size
+
+    def __drag_handle(self, event):
+        new_size = Vector(event.x_root, event.y_root) - self.__click_offset
+        self.size = self._clamp_size(new_size)
+
+    def __fit_parent(self, event=None):
+        """moves the widget back inside of the parent"""
+        self.position = self.position
+
+    def _clamp_size(self, size):
+        """
+        Clamps a vector size so that it does not go out of bounds of the parent
+        """
+        if isinstance(self.parent, Sized):
+            return size.clamp(high=self.parent.size - self.position)
+        return size
+
+    @property
+    def selected(self):
+        return self._selected
+
+    @selected.setter
+    def selected(self, value):
+        self.__show_selected(value)
+        # callback
+        if value and "selected" in self._events:
+            self._events.emit("selected", SelectEvent(self, False))
+        if not value and "unselected" in self._events:
+            self._events.emit("unselected", SelectEvent(self, False))
+
+    def shift_position(self, delta):
+        """
+        Records a move by the delta that was already done on the canvas, for
+        example by moving a tag of several widgets at once
+        """
+        self._position = self._position + delta
+        # callback
+        if "moved" in self._events:
+            self._events.emit("moved", MoveEvent(self, delta))
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        # keep the widget inside of the parent
+        high = None
+        if isinstance(self.parent, Sized):
+            high = self.parent.size - self.size
+        value = value.clamp((0, 0), high)
+
+        # move every item of the widget by the delta
+        delta = value - self._position
+        self._position = value
+        self.canvas.move(self.tag, delta.x, delta.y)
+        # callback
+        if "moved" in self._events:
+            self._events.emit("moved", MoveEvent(self, delta))
+
+    @property
+    def size(self):
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        self._size = value.clamp(low=(10, 10))
+        self.__layout()
+        # callback
+        if "resized" in self._events:
+            self._events.emit("resized", Event(self))
+
+
+class ItemButtonImpl(Button, TkItemWidgetImpl):
+    """A Button drawn as canvas items. See TkItemWidgetImpl"""
+    preview_fill = colors.white_secondary
+    preview_outline = colors.darkblue_secondary
+
+    def __init__(self, canvas=None, text="Button", size=Vector(50, 40),
+                 **kwargs):
+        self._text = text
+        super().__init__(text=text, size=size, **kwargs)
+
+    def create_widget(self):
+        return ttk.Label(self.canvas, style="TButton")
+
+    def configure_widget(self):
+        self.widget["text"] = self.text
+
+    def preview_text(self):
+        return self.text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.refresh()
+
+
+class ItemLabelImpl(Label, TkItemWidgetImpl):
+    """A Label drawn as canvas items. See TkItemWidgetImpl"""
+    preview_fill = None
+    preview_outline = ""
+    preview_anchor = tk.W
+
+    def __init__(self, canvas=None, text="Label", size=Vector(35, 20),
+                 **kwargs):
+        self._text = text
+        super().__init__(text=text, size=size, **kwargs)
+
+    def create_widget(self):
+        return ttk.Label(self.canvas, style="TLabel")
+
+    def configure_widget(self):
+        self.widget["text"] = self.text
+
+    def preview_text(self):
+        return self.text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.refresh()
+
+
+class ItemCheckbuttonImpl(Checkbutton, TkItemWidgetImpl):
+    """A Checkbutton drawn as canvas items. See TkItemWidgetImpl"""
+    preview_fill = None
+    preview_outline = ""
+    preview_anchor = tk.W
+    preview_box = True
+
+    def __init__(self, canvas=None, text="Checkbutton", **kwargs):
+        self._text = text
+        super().__init__(text=text, **kwargs)
+
+    def create_widget(self):
+        self.intvar = tk.IntVar()
+        self.intvar.set(0)
+        return ttk.Checkbutton(self.canvas,
+                               style="CheckbuttonStyle.Checkbutton",
+                               variable=self.intvar, offvalue=0, onvalue=0)
+
+    def configure_widget(self):
+        self.widget["text"] = self.text
+
+    def preview_text(self):
+        return self.text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.refresh()
+
+
+class ItemEntryImpl(Entry, TkItemWidgetImpl):
+    """An Entry drawn as canvas items. See TkItemWidgetImpl"""
+    preview_fill = "white"
+
+    def __init__(self, canvas=None, text="", justify="left", show="",
+                 **kwargs):
+        self._text = text
+        self._justify = justify
+        self._show = show
+        super().__init__(text=text, justify=justify, show=show, **kwargs)
+
+    def create_widget(self):
+        return ttk.Entry(self.canvas, style="EntryStyle.TEntry")
+
+    def configure_widget(self):
+        self.widget["state"] = tk.NORMAL
+        self.widget.delete(0, tk.END)
+        self.widget.insert(0, self.text)
+        self.widget["justify"] = self.justify
+        self.widget["show"] = self.show
+        self.widget["state"] = tk.DISABLED
+
+    def preview_text(self):
+        if self.show:
+            return self.show[0] * len(self.text)
+        return self.text
+
+    @property
+    def preview_anchor(self):
+        return {"right": tk.E, "center": tk.CENTER}.get(self.justify, tk.W)
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.refresh()
+
+    @property
+    def justify(self):
+        return self._justify
+
+    @justify.setter
+    def justify(self, value):
+        if value not in ("right", "center"):
+            value = "left"
+        self._justify = value
+        self.refresh()
+
+    @property
+    def show(self):
+        return self._show
+
+    @show.setter
+    def show(self, value):
+        self._show = value
+        self.refresh()
+
+
+class ItemTextImpl(Text, TkItemWidgetImpl):
+    """A Text drawn as canvas items. See TkItemWidgetImpl"""
+    preview_fill = "white"
+    preview_anchor = tk.NW
+
+    def __init__(self, canvas=None, text="", size=Vector(200, 40), **kwargs):
+        self._text = text
+        super().__init__(size=size, **kwargs)
+
+    def create_widget(self):
+        return tk.Text(self.canvas, state=tk.DISABLED)
+
+    def configure_widget(self):
+        self.widget["state"] = tk.NORMAL
+        self.widget.delete(1.0, tk.END)
+        self.widget.insert(1.0, self.text)
+        self.widget["state"] = tk.DISABLED
+
+    def preview_text(self):
+        return self.text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.refresh()
+
+
+class ItemCanvasImpl(Canvas, TkItemWidgetImpl):
+    """A Canvas drawn as canvas items. See TkItemWidgetImpl"""
+    def __init__(self, canvas=None, bg="White", **kwargs):
+        self._bg = bg
+        super().__init__(bg=bg, **kwargs)
+
+    def create_widget(self):
+        return tk.Canvas(self.canvas, bg=self.bg)
+
+    def configure_widget(self):
+        self.widget.config(bg=self.bg)
+
+    @property
+    def preview_fill(self):
+        return self.bg
+
+    @property
+    def bg(self):
+        return self._bg
+
+    @bg.setter
+    def bg(self, value):
+        self._bg = value
+        self.refresh()
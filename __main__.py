@@ -1 +1,10 @@
-from main_window import *
+import sys
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # convert files without showing the designer. See batch_convert.py
+        import batch_convert
+        sys.exit(batch_convert.main(sys.argv[1:]))
+    else:
+        import main_window
+        main_window.initialize()
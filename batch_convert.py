@@ -0,0 +1,127 @@
+"""
+    batch_convert.py
+
+    Loads designer files without tk and saves them again through codegen, so
+    every file comes out in the same generated form. Files are converted in
+    parallel in a pool of processes, and the time each one took is printed.
+    Run with: python batch_convert.py [options] file.py ...
+    or: python __main__.py [options] file.py ...
+"""
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+import guicore
+
+
+def convert_file(filename, output_filename, keep_layout=False):
+    """
+    loads filename into gui model objects and saves them to output_filename.
+    With keep_layout only initialize() is regenerated and the rest of the
+    file is kept as it was, else the whole file is regenerated.
+    Returns (filename, seconds taken, number of gui objects, error message or
+    None)
+    """
+    start = time.perf_counter()
+    try:
+        with open(filename, mode="r") as file:
+            source = file.read()
+        layout = guicore.get_source_layout(source)
+        models = guicore.load_models(source)
+        # the code editor's text always ends with a newline
+        user_code = layout.get_user_code() + "\n"
+        guicore.save_gui(output_filename, models, user_code,
+                         layout if keep_layout else None)
+    except Exception as e:
+        return filename, time.perf_counter() - start, 0, str(e) or repr(e)
+    return filename, time.perf_counter() - start, len(models), None
+
+
+def get_output_filename(filename, output_dir):
+    """returns where the converted file is saved. None output_dir means in place"""
+    if output_dir is None:
+        return filename
+    return os.path.join(output_dir, os.path.basename(filename))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="batch_convert",
+        description="Loads designer files without a display and saves them "
+                    "again with the generated code.")
+    parser.add_argument("files", nargs="+", metavar="file",
+                        help="the designer .py files to convert")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("-o", "--output-dir",
+                       help="the directory to save the converted files in")
+    where.add_argument("-i", "--in-place", action="store_true",
+                       help="replace the files with their converted source")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="how many processes convert files at once "
+                             "(default: the number of cpus)")
+    parser.add_argument("-k", "--keep-layout", action="store_true",
+                        help="only regenerate initialize() and keep the rest "
+                             "of each file as it is")
+    return parser.parse_args(argv)
+
+
+def get_duplicate_outputs(jobs):
+    """
+    returns a dict of each output filename that more than one input file
+    would be saved to, and the input files
+    """
+    inputs = {}  # k -> output filename, v -> list of input filenames
+    for filename, output_filename, keep_layout in jobs:
+        key = os.path.normcase(os.path.abspath(output_filename))
+        inputs.setdefault(key, []).append(filename)
+    return {output: filenames for output, filenames in inputs.items()
+            if len(filenames) > 1}
+
+
+def main(argv=None):
+    """converts the files given on the command line. Returns the exit code"""
+    args = parse_args(argv)
+    jobs = [(filename, get_output_filename(filename, args.output_dir),
+             args.keep_layout) for filename in args.files]
+    duplicates = get_duplicate_outputs(jobs)
+    if duplicates:
+        # one converted file would silently replace another
+        for output, filenames in duplicates.items():
+            print("%s would be saved to %s" % (", ".join(filenames), output))
+        print("nothing was converted")
+        return 2
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+    start = time.perf_counter()
+    if args.jobs is None or args.jobs <= 1 or len(jobs) == 1:
+        results = (convert_file(*job) for job in jobs)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs)
+        # results are printed as each file finishes, so a slow file does not
+        # hold back the ones after it
+        futures = [executor.submit(convert_file, *job) for job in jobs]
+        results = (future.result()
+                   for future in concurrent.futures.as_completed(futures))
+    failed = 0
+    try:
+        for filename, seconds, object_count, error in results:
+            if error is None:
+                print("%8.1f ms  %4d objects  %s" %
+                      (seconds * 1000, object_count, filename))
+            else:
+                failed += 1
+                print("%8.1f ms  failed        %s: %s" %
+                      (seconds * 1000, filename, error))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print("converted %d of %d files in %.1f ms" %
+          (len(jobs) - failed, len(jobs),
+           (time.perf_counter() - start) * 1000))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
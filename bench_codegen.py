@@ -0,0 +1,353 @@
+"""
+    bench_codegen.py
+
+    Compares how long saving a 5,000 widget window takes with codegen's
+    CodeWriter and with the str += code it replaced, and checks that both
+    generate the same file. Also compares the peak memory of building the
+    file as one string with streaming it to disk.
+    Run with: python bench_codegen.py
+"""
+
+import os
+import re
+import tempfile
+import timeit
+import tracemalloc
+import guimodel
+import codegen
+
+
+# The functions below are copies of the str += source generation from
+# main_window. They are only kept here so the two can be compared.
+
+def save_command(cmd):
+    """
+    Given a str value for a command return the str that must be written in the
+    assignment value.
+
+    Basically adds lambda if we need to
+    """
+    if re.match(r".*\(.*\).*", cmd):
+        return "lambda: " + cmd
+    else:
+        return cmd
+
+
+def legacy_gui_to_src(gui_objects, user_code, helper_code):
+    src = ""
+    associated_vars = []
+    mainloop = ""
+    # get the widget creation code
+    for obj in gui_objects:
+        # Checkbutton is a subclass of Label so it is checked first
+        if isinstance(obj, guimodel.Checkbutton):
+            src += checkbutton_to_src(obj, associated_vars)
+        elif isinstance(obj, guimodel.Label):
+            src += label_to_src(obj)
+        elif isinstance(obj, guimodel.Text):
+            src += text_to_src(obj)
+        elif isinstance(obj, guimodel.Button):
+            src += button_to_src(obj)
+        elif isinstance(obj, guimodel.Entry):
+            src += entry_to_src(obj, associated_vars)
+        elif isinstance(obj, guimodel.Window):
+            root_src, mainloop = root_to_src(obj)
+            src += root_src
+        elif isinstance(obj, guimodel.Canvas):
+            src += canvas_to_src(obj, associated_vars)
+    src += mainloop
+    # indent all the widget code
+    lines = src.splitlines()
+    src = ""
+    for line in lines:
+        src += (" " * 4) + line + "\n"
+    _globals = "\n    global "
+    for obj in gui_objects:
+        _globals += obj.name + ", "
+    _globals = _globals[0:-2] + "\n"
+    # add user code and helper methods
+    src = (user_code + helper_code + "\n" + "def initialize():" +
+        _globals + src + "initialize()\n")
+    return src
+
+
+def label_to_src(label):
+    """returns a string of the generated src for the label"""
+    n = label.name
+    posx = str(label.position.x)
+    posy = str(label.position.y)
+    sizex = str(label.size.x)
+    sizey = str(label.size.y)
+    text = label.text
+    parent = label.parent.name
+
+    src = ("""%(n)s = Label(%(parent)s)
+%(n)s["text"] = "%(text)s"
+%(n)s.place(x=%(posx)s, y=%(posy)s, width=%(sizex)s, height=%(sizey)s)\n\n""" %
+           locals())
+    return src
+
+
+def button_to_src(button):
+    """returns a string of the generated src for the button"""
+    name = button.name
+    posx = str(button.position.x)
+    posy = str(button.position.y)
+    sizex = str(button.size.x)
+    sizey = str(button.size.y)
+    text = button.text
+    parent = button.parent.name
+    command = save_command(button.command)
+
+    src = ""
+    if command:
+        src += ("%(name)s = Button(%(parent)s, command=%(command)s)\n" %
+                locals())
+    else:
+        src += "%(name)s = Button(%(parent)s)\n" % locals()
+    src += '%(name)s["text"] = "%(text)s"\n' % locals()
+    src += '%(name)s.place(x=%(posx)s, y=%(posy)s, width=%(sizex)s,' % locals()
+    src += ' height=%(sizey)s)\n\n' % locals()
+    return src
+
+
+def entry_to_src(entry, associated_vars):
+    """
+    returns a string of the generated src for the entry.
+    associated_vars is a list of already generated associated variables
+    """
+    name = entry.name
+    posx = str(entry.position.x)
+    posy = str(entry.position.y)
+    sizex = str(entry.size.x)
+    sizey = str(entry.size.y)
+    text = entry.text
+    parent = entry.parent.name
+    justify = entry.justify
+    show = entry.show
+    associated_variable = entry.associated_variable
+    validate = entry.validate
+    validate_command = save_command(entry.validate_command)
+    src = ""
+
+    if associated_variable and associated_variable not in associated_vars:
+        src += "%(associated_variable)s = StringVar()\n\n" % locals()
+        associated_vars.append(associated_variable)
+    src += """%(name)s = Entry(%(parent)s)
+%(name)s.insert(0, "%(text)s")\n""" % locals()
+    if associated_variable:
+        src += ('%(name)s["textvariable"] = %(associated_variable)s\n'
+                % locals())
+    if justify:
+        src += '%(name)s["justify"] = "%(justify)s"\n' % locals()
+    if show:
+        src += '%(name)s["show"] = "%(show)s"\n' % locals()
+    if validate:
+        src += '%(name)s["validate"] = "%(validate)s"\n' % locals()
+    if validate_command:
+        src += ('%(name)s["validatecommand"] = %(validate_command)s\n'
+                % locals())
+    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
+    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
+    return src
+
+
+def text_to_src(text):
+    """
+    returns the string of the generated src for the text
+    """
+    name = text.name
+    posx = str(text.position.x)
+    posy = str(text.position.y)
+    sizex = str(text.size.x)
+    sizey = str(text.size.y)
+    parent = text.parent.name
+    src = ""
+    src += '%(name)s = Text(%(parent)s)\n' % locals()
+    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
+    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
+    return src
+
+
+def canvas_to_src(canvas, associated_vars):
+    """
+    returns the string of the generated src for the entry.
+    associated_vars in a list of already generated associated variables
+    """
+    name = canvas.name
+    posx = str(canvas.position.x)
+    posy = str(canvas.position.y)
+    sizex = str(canvas.size.x)
+    sizey = str(canvas.size.y)
+    parent = canvas.parent.name
+    bg = canvas.bg
+    src = ""
+    src += '%(name)s = Canvas(%(parent)s, bg="%(bg)s")\n' % locals()
+    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
+    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
+    return src
+
+
+def checkbutton_to_src(checkbutton, associated_vars):
+    """
+    returns the string of the generated src for the entry.
+    associated_vars in a list of already generated associated variables
+    """
+    name = checkbutton.name
+    posx = str(checkbutton.position.x)
+    posy = str(checkbutton.position.y)
+    sizex = str(checkbutton.size.x)
+    sizey = str(checkbutton.size.y)
+    text = checkbutton.text
+    parent = checkbutton.parent.name
+    command = checkbutton.command
+    offvalue = checkbutton.offvalue
+    onvalue = checkbutton.onvalue
+    takefocus = checkbutton.takefocus
+    variable = checkbutton.variable
+    # to know if we should use StringVar or IntVar
+    isnumeric = onvalue.isnumeric() and offvalue.isnumeric()
+    src = ""
+
+    if variable and variable not in associated_vars:
+        if isnumeric:
+            src += "%(variable)s = IntVar()\n" % locals()
+        else:
+            src += "%(variable)s = StringVar()\n" % locals()
+        associated_vars.append(variable)
+    if command:
+        src += '%(name)s = Checkbutton(%(parent)s, ' % locals()
+        src += 'command=%(command)s)\n' % locals()
+    else:
+        src += '%(name)s = Checkbutton(%(parent)s)\n' % locals()
+    src += '%(name)s["text"] = "%(text)s"\n' % locals()
+    if variable:
+        src += '%(name)s["variable"] = %(variable)s\n' % locals()
+    if onvalue:
+        if isnumeric:
+            src += '%(name)s["onvalue"] = %(onvalue)s\n' % locals()
+        else:
+            src += '%(name)s["onvalue"] = "%(onvalue)s"\n' % locals()
+    if offvalue:
+        if isnumeric:
+            src += '%(name)s["offvalue"] = %(offvalue)s\n' % locals()
+        else:
+            src += '%(name)s["offvalue"] = "%(offvalue)s"\n' % locals()
+    if takefocus:
+        src += '%(name)s["takefocus"] = %(takefocus)s\n' % locals()
+    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
+    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
+    return src
+
+
+def root_to_src(_root):
+    """
+    returns a tuple
+    tuple[0] is src to create window
+    tuple[1] is src to start mainloop
+    the mainloop src should be added after all other widgets are added to src
+    """
+    name = _root.name
+    title = _root.title
+    sizex = str(_root.size.x)
+    sizey = str(_root.size.y)
+    geometry = sizex + "x" + sizey
+
+    src = """
+%(name)s = Tk()
+%(name)s.title("%(title)s")
+%(name)s.geometry("%(geometry)s")\n\n""" % locals()
+    mainloop = "%(name)s.mainloop()" % locals()
+    return src, mainloop
+
+
+def make_window(widget_count):
+    """returns the gui objects of a window with widget_count widgets"""
+    window = guimodel.Window(title="bench", size=guimodel.Vector(800, 600))
+    objects = [window]
+    for i in range(widget_count):
+        position = guimodel.Vector(i % 800, i % 600)
+        kind = i % 6
+        if kind == 0:
+            obj = guimodel.Label(name="label%d" % i, parent=window,
+                               position=position, text="Label %d" % i)
+        elif kind == 1:
+            obj = guimodel.Button(name="button%d" % i, parent=window,
+                                position=position, text="Button %d" % i,
+                                command="on_click(%d)" % i)
+        elif kind == 2:
+            obj = guimodel.Entry(name="entry%d" % i, parent=window,
+                               position=position, show="*",
+                               associated_variable="var%d" % (i // 12))
+        elif kind == 3:
+            obj = guimodel.Text(name="text%d" % i, parent=window,
+                              position=position)
+        elif kind == 4:
+            obj = guimodel.Canvas(name="canvas%d" % i, parent=window,
+                                position=position)
+        else:
+            obj = guimodel.Checkbutton(name="checkbutton%d" % i, parent=window,
+                                     position=position, onvalue="1",
+                                     offvalue="0", variable="var%d" % (i // 12))
+        obj.size = guimodel.Vector(90, 20)
+        objects.append(obj)
+    return objects
+
+
+def strip_blank_lines(src):
+    """the += code indented empty lines, the CodeWriter leaves them empty"""
+    return "\n".join(line.rstrip() for line in src.split("\n"))
+
+
+def benchmark(widget_counts=(500, 1000, 5000), number=5):
+    user_code = "from tkinter import *\n\n"
+    helper_code = open("helpermethods.py", mode="r").read()
+    print("save time, best of %d runs" % number)
+    for widget_count in widget_counts:
+        objects = make_window(widget_count)
+        old = legacy_gui_to_src(objects, user_code, helper_code)
+        new = codegen.gui_to_src(objects, user_code, helper_code)
+        assert strip_blank_lines(old) == strip_blank_lines(new)
+        old_time = min(timeit.repeat(
+            lambda: legacy_gui_to_src(objects, user_code, helper_code),
+            number=1, repeat=number))
+        new_time = min(timeit.repeat(
+            lambda: codegen.gui_to_src(objects, user_code, helper_code),
+            number=1, repeat=number))
+        print("%5d widgets  str +=: %8.2f ms  CodeWriter: %6.2f ms  "
+              "(%d bytes)" % (widget_count, old_time * 1000, new_time * 1000,
+                              len(new)))
+
+
+
+def peak_memory(save):
+    tracemalloc.start()
+    save()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_save(widget_count=5000):
+    user_code = "from tkinter import *\n\n"
+    helper_code = open("helpermethods.py", mode="r").read()
+    objects = make_window(widget_count)
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "gui.py")
+
+        def save_string():
+            src = codegen.gui_to_src(objects, user_code, helper_code)
+            with open(filename, "w") as file:
+                file.write(src)
+
+        def save_stream():
+            codegen.save_gui_src(filename, objects, user_code, helper_code)
+
+        print("%d widgets, peak memory while saving" % widget_count)
+        print("one string: %7d bytes" % peak_memory(save_string))
+        print("streamed:   %7d bytes" % peak_memory(save_stream))
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_save()
@@ -0,0 +1,243 @@
+"""
+    bench_indent_scanner.py
+
+    Compares the speed of the matching functions in indent_scanner.py, which
+    use precompiled module level regexes, with the versions they replaced.
+    Run with: python bench_indent_scanner.py
+"""
+
+import re
+import timeit
+import indent_scanner
+
+
+# The implementations below are copies of the indent_scanner functions before
+# they used the precompiled tokenizer regex. They are only kept here so the
+# two can be compared.
+
+def legacy_match_open_string(text):
+    """returns True if a multiline string is opened and NOT closed"""
+    quotes = ["'", '"']
+    for quote in quotes:
+        state = "ENTER"
+        for char in text:
+            if state == "ENTER":
+                if char == quote:
+                    state = "FIRST_OPEN_QUOTE"
+                    continue
+                elif char == '\\':
+                    state = "OPENING_ESCAPED_CHAR"
+                    continue
+                elif char == '#':
+                    state = "COMMENT"
+                    continue
+                else:
+                    state = "ENTER"
+                    continue
+            elif state == "COMMENT":
+                if char == '\n':
+                    state = "ENTER"
+                    continue
+                else:
+                    state = "COMMENT"
+                    continue
+            elif state == "FIRST_OPEN_QUOTE":
+                if char == quote:
+                    state = "SECOND_OPEN_QUOTE"
+                    continue
+                elif char == '\\':
+                    state = "OPENING_ESCAPED_CHAR"
+                    continue
+                else:
+                    state = "ENTER"
+                    continue
+            elif state == "SECOND_OPEN_QUOTE":
+                if char == quote:
+                    state = "INNER_QUOTE"
+                    continue
+                if char == '\\':
+                    state = "OPENING_ESCAPED_CHAR"
+                    continue
+                if char == '#':
+                    state = "COMMENT"
+                    continue
+                else:
+                    state = "ENTER"
+                    continue
+            elif state == "OPENING_ESCAPED_CHAR":
+                state = "ENTER"
+                continue
+            elif state == "INNER_QUOTE":
+                if char == quote:
+                    state = "FIRST_ENDING_QUOTE"
+                    continue
+                elif char == '\\':
+                    state = "INNER_QUOTE_ESCAPED_CHAR"
+                    continue
+                else:
+                    state = "INNER_QUOTE"
+                    continue
+            elif state == "INNER_QUOTE_ESCAPED_CHAR":
+                state = "INNER_QUOTE"
+                continue
+            elif state == "FIRST_ENDING_QUOTE":
+                if char == quote:
+                    state = "SECOND_ENDING_QUOTE"
+                    continue
+                elif char == '\\':
+                    state = "INNER_QUOTE_ESCAPED_CHAR"
+                    continue
+                else:
+                    state = "INNER_QUOTE"
+                    continue
+            elif state == "SECOND_ENDING_QUOTE":
+                if char == quote:
+                    state = "ENTER"
+                    continue
+                if char == '\\':
+                    state = "INNER_QUOTE_ESCAPED_CHAR"
+                    continue
+                else:
+                    state = "INNER_QUOTE"
+                    continue
+        if state in ("INNER_QUOTE", "FIRST_ENDING_QUOTE", "SECOND_ENDING_QUOTE", "INNER_QUOTE_ESCAPED_CHAR"):
+            return True
+    return False
+
+
+def legacy_scan_line(line, state=indent_scanner.EMPTY_STATE):
+    """the character by character scan_line() used before the tokenizer regex"""
+    quote, brackets = state
+    i = 0
+    length = len(line)
+    while i < length:
+        char = line[i]
+        if quote is not None:
+            # inside a triple quoted string. Look for the closing quote
+            if char == '\\':
+                i += 2
+            elif line.startswith(quote, i):
+                quote = None
+                i += 3
+            else:
+                i += 1
+        elif char == '#':
+            # the rest of the line is a comment
+            break
+        elif char in "'\"":
+            if line.startswith(char * 3, i):
+                quote = char * 3
+                i += 3
+                continue
+            # single quoted strings always end on the same line
+            i += 1
+            while i < length and line[i] != char:
+                if line[i] == '\\':
+                    i += 1
+                i += 1
+            i += 1
+        elif char in "([{":
+            rest = line[i+1:]
+            text = rest.lstrip(' ')
+            if len(text) == 0 or text.startswith('#'):
+                column = len(line) - len(line.lstrip(' ')) + 4
+            else:
+                column = i + 1 + len(rest) - len(text)
+            brackets += ((char, column),)
+            i += 1
+        elif char in ")]}":
+            brackets = brackets[:-1]
+            i += 1
+        else:
+            i += 1
+    return quote, brackets
+
+
+def legacy_match_opener(line):
+    """return True if opening an indent block"""
+    line = line.strip(' ')
+    synchre = re.compile(r"""
+        ^
+        [ \t]*
+        (?: while
+        |   if
+        |   else
+        |   def
+        |   return
+        |   assert
+        |   break
+        |   class
+        |   continue
+        |   elif
+        |   try
+        |   except
+        |   raise
+        |   import
+        |   yield
+        )
+        \b
+    """, re.VERBOSE | re.MULTILINE).search
+    is_opener = bool(synchre(line))
+    return is_opener and line.endswith(':')
+
+
+def legacy_match_closer(line):
+    """returns True if closing an indent block"""
+    line = line.lstrip(' ')
+    closere = re.compile(r"""
+        \s*
+        (?: return
+        |   break
+        |   continue
+        |   raise
+        |   pass
+        )
+        \b
+    """, re.VERBOSE).match
+    return bool(closere(line))
+
+
+def make_source(line_count):
+    """returns python source with the given number of lines, made by repeating the files of this program"""
+    lines = []
+    for filename in ("main_window.py", "GUIObj.py", "guiparser.py",
+                     "code_editor.py"):
+        with open(filename, "r") as file:
+            lines.extend(file.read().split("\n"))
+    return "\n".join(lines[i % len(lines)] for i in range(line_count))
+
+
+def scan_all(scan, lines):
+    state = indent_scanner.EMPTY_STATE
+    for line in lines:
+        state = scan(line, state)
+    return state
+
+
+def benchmark(line_count=10000, number=5):
+    source = make_source(line_count)
+    lines = source.split("\n")
+    cases = (
+        ("match_open_string",
+         lambda: legacy_match_open_string(source),
+         lambda: indent_scanner.match_open_string(source)),
+        ("scan_line",
+         lambda: scan_all(legacy_scan_line, lines),
+         lambda: scan_all(indent_scanner.scan_line, lines)),
+        ("match_opener",
+         lambda: [legacy_match_opener(line) for line in lines],
+         lambda: [indent_scanner.match_opener(line) for line in lines]),
+        ("match_closer",
+         lambda: [legacy_match_closer(line) for line in lines],
+         lambda: [indent_scanner.match_closer(line) for line in lines]),
+    )
+    print("%d lines, best of %d runs" % (line_count, number))
+    for name, old, new in cases:
+        old_time = min(timeit.repeat(old, number=1, repeat=number))
+        new_time = min(timeit.repeat(new, number=1, repeat=number))
+        print("%-18s old: %8.2f ms  new: %8.2f ms  (%.1fx)" %
+              (name, old_time * 1000, new_time * 1000, old_time / new_time))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,110 @@
+"""
+    bench_vector.py
+
+    Compares the allocations and speed of a 1,000 event drag using the
+    immutable GUIObj.Vector with the mutable Vector it replaced. The drag
+    steps below follow TkMovableWidgetImpl's __drag and position setter,
+    without the tk calls.
+    Run with: python bench_vector.py
+"""
+
+import sys
+import timeit
+import tracemalloc
+import GUIObj
+
+
+# The classes below are copies of the mutable Vector and the drag code that
+# used it. They are only kept here so the two can be compared.
+
+class LegacyVector:
+    """Represents a position in 2d space"""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __add__(self, other):
+        return LegacyVector(self.x + other.x, self.y + other.y)
+
+
+class LegacyDrag:
+    def __init__(self):
+        self.maxpos = LegacyVector(800, 600)
+        self.click_offset = LegacyVector(5, 5)
+        self.position = LegacyVector(0, 0)
+        self.moved = []
+
+    def drag(self, x_root, y_root):
+        new_pos = LegacyVector(0, 0)
+        new_pos.x = x_root - self.click_offset.x
+        new_pos.y = y_root - self.click_offset.y
+        self.set_position(new_pos)
+
+    def set_position(self, value):
+        if value.x > self.maxpos.x:
+            value.x = self.maxpos.x
+        if value.y > self.maxpos.y:
+            value.y = self.maxpos.y
+        if value.x < 0:
+            value.x = 0
+        if value.y < 0:
+            value.y = 0
+        delta_x = value.x - self.position.x
+        delta_y = value.y - self.position.y
+        self.position = value
+        self.moved.append(LegacyVector(delta_x, delta_y))
+
+
+class Drag:
+    def __init__(self):
+        self.maxpos = GUIObj.Vector(800, 600)
+        self.click_offset = GUIObj.Vector(5, 5)
+        self.position = GUIObj.Vector(0, 0)
+        self.moved = []
+
+    def drag(self, x_root, y_root):
+        self.set_position(GUIObj.Vector(x_root, y_root) - self.click_offset)
+
+    def set_position(self, value):
+        value = value.clamp((0, 0), self.maxpos)
+        delta = value - self.position
+        self.position = value
+        self.moved.append(delta)
+
+
+def run_drag(drag_type, events):
+    drag = drag_type()
+    for x, y in events:
+        drag.drag(x, y)
+    return drag
+
+
+def vector_size(vector):
+    """returns the bytes used by the vector, including its attribute dict"""
+    size = sys.getsizeof(vector)
+    if hasattr(vector, "__dict__"):
+        size += sys.getsizeof(vector.__dict__)
+    return size
+
+
+def benchmark(event_count=1000, number=20):
+    # the pointer goes past the edge of the window so clamping happens too
+    events = [(i, i // 2) for i in range(event_count)]
+    cases = (("mutable", LegacyDrag, LegacyVector(1, 2)),
+             ("immutable", Drag, GUIObj.Vector(1, 2)))
+    print("%d drag events, best of %d runs" % (event_count, number))
+    for name, drag_type, vector in cases:
+        run_time = min(timeit.repeat(lambda: run_drag(drag_type, events),
+                                     number=1, repeat=number))
+        tracemalloc.start()
+        drag = run_drag(drag_type, events)
+        kept, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print("%-10s %6.2f ms  %3d bytes per vector  %7d bytes kept "
+              "(%d moved deltas)" % (name, run_time * 1000,
+                                     vector_size(vector), kept,
+                                     len(drag.moved)))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -5,6 +5,7 @@ import re
 import keyword
 import builtins
 import indent_scanner
+import text_buffer
 
 
 def any(name, alternates):
@@ -37,11 +38,51 @@ prog = re.compile(make_pat(), re.S)
 idprog = re.compile(r"\s+(\w+)", re.S)
 
 
+# Modified from Python3.5\Lib\idlelib\WidgetRedirector.py
+class TextRedirector:
+    """
+    Intercepts the tcl commands of a tk widget. The widget's tcl command is
+    renamed and replaced by dispatch(), so every operation on the widget
+    (typing, pasting, undo, and calls from python) can be seen before it is
+    passed on to the real widget.
+    """
+    def __init__(self, widget):
+        self.widget = widget
+        self._operations = {}
+        self.orig = widget._w + "_orig"
+        widget.tk.call("rename", widget._w, self.orig)
+        widget.tk.createcommand(widget._w, self.dispatch)
+
+    def register(self, operation, function):
+        """
+        Calls function instead of the operation. Returns a function that
+        performs the original operation
+        """
+        self._operations[operation] = function
+        return lambda *args: self.widget.tk.call((self.orig, operation) + args)
+
+    def dispatch(self, operation, *args):
+        function = self._operations.get(operation)
+        try:
+            if function:
+                return function(*args)
+            else:
+                return self.widget.tk.call((self.orig, operation) + args)
+        except tk.TclError:
+            return ""
+
+
 class CodeEditor(ttk.Frame):
+    # the most lines colorize() may scan in one background tick. Keeps the
+    # time spent inside a single tk callback short on large files
+    lines_per_tick = 200
+
     def __init__(self, parent, *args, **kwargs):
         self.is_modifing = False
+        self.after_id = None  # the scheduled background colorize
+        self.pasting = False  # True from a paste event until its text is inserted
         ttk.Frame.__init__(self, parent)
-        self.lineNumbers = ""
+        self.line_count = 0  # how many line numbers the gutter shows
         self.linenums_text = tk.Text(self,
                                      width=4,
                                      takefocus=0,
@@ -58,12 +99,24 @@ class CodeEditor(ttk.Frame):
                             bd=0,
                             wrap=tk.NONE)
         self.text.grid(row=0, column=1, sticky="NSEW")
+        # a copy of the text that is kept up to date with every edit, so
+        # reading it never has to ask tk for the whole text again. The
+        # scanner shares its lines
+        self.buffer = text_buffer.TextBuffer(self.text.get("1.0", "end-1c"))
+        self.scanner = indent_scanner.IndentScanner(self.buffer)
+        # watch every edit so only the changed lines need to be recolorized
+        # and rescanned
+        self.redirector = TextRedirector(self.text)
+        self._insert = self.redirector.register("insert", self._on_insert)
+        self._delete = self.redirector.register("delete", self._on_delete)
+        self._replace = self.redirector.register("replace", self._on_replace)
         self.text.bind("<<Modified>>", self._modified)
         self.text.bind("<Key-Return>", self._newline_indent)
         self.text.bind("<Key-KP_Enter>", self._newline_indent)
         self.text.bind("<Key-Tab>", self._indent)
-        self.text.bind("<<Paste>>", lambda event: self.text.after(0, self.replace_indents))
-        self.text.bind("<<PasteSelection>>", lambda event: self.text.after(0, self.replace_indents))
+        # these run before the text's own paste bindings, which do the insert
+        self.text.bind("<<Paste>>", self._paste)
+        self.text.bind("<<PasteSelection>>", self._paste)
         self.vert_scrollbar = ttk.Scrollbar(self)
         self.vert_scrollbar.grid(row=0, column=2, sticky="NS")
         horz_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL)
@@ -86,12 +139,83 @@ class CodeEditor(ttk.Frame):
         self.linenums_text.yview(*args)
         self.text.yview(*args) 
 
+    def _text_position(self, index):
+        """
+        returns the 0-based line and column of a text index. Indexes past the
+        final newline are moved before it, the same as the text widget does
+        """
+        if self.text.compare(index, ">", "end-1c"):
+            index = "end-1c"
+        line, column = self.text.index(index).split('.')
+        return int(line) - 1, int(column)
+
+    def _paste(self, event=None):
+        """called before text is pasted. Makes the next insert replace its tabs"""
+        self.pasting = True
+        # if nothing is inserted, e.g. the clipboard is empty
+        self.text.after_idle(self._end_paste)
+
+    def _end_paste(self):
+        self.pasting = False
+
+    def _update_buffer(self, first, last, count):
+        """
+        replaces lines first up to (not including) last of the buffer with
+        the count lines that are now in their place in the text. Lines are
+        read back from tk because tk columns count characters outside of the
+        BMP twice, so they cannot be used to slice python strings
+        """
+        new_lines = self.text.get("%d.0" % (first + 1),
+                                  "%d.0 lineend" % (first + count)).split("\n")
+        self.buffer.replace_lines(first, last, new_lines)
+
+    def _on_insert(self, index, chars, *args):
+        """called instead of the text's insert. Marks the inserted range to be recolorized"""
+        if self.pasting:
+            # only the pasted text has its tabs replaced with spaces
+            self.pasting = False
+            chars = chars.replace("\t", " " * 4)
+            args = tuple(arg.replace("\t", " " * 4) if i % 2 else arg
+                         for i, arg in enumerate(args))
+        # insert may be given more chars and tags pairs after the first chars
+        inserted = chars + "".join(args[1::2])
+        line, column = self._text_position(index)
+        index = "%d.%d" % (line + 1, column)
+        self._insert(index, chars, *args)
+        self._update_buffer(line, line + 1, inserted.count("\n") + 1)
+        self.text.tag_add("TODO", index, index + "+%dc" % len(inserted))
+
+    def _on_delete(self, index1, index2=None):
+        """called instead of the text's delete. Marks the place of the deletion to be recolorized"""
+        first = self._text_position(index1)
+        if index2 is None:
+            last = self._text_position(index1 + "+1c")
+        else:
+            last = self._text_position(index2)
+        if last <= first:
+            # the text widget ignores these deletes too
+            return
+        index1 = "%d.%d" % (first[0] + 1, first[1])
+        self._delete(index1, "%d.%d" % (last[0] + 1, last[1]))
+        self._update_buffer(first[0], last[0] + 1, 1)
+        self.text.tag_add("TODO", index1)
+
+    def _on_replace(self, index1, index2, chars, *args):
+        """called instead of the text's replace. Marks the replaced range to be recolorized"""
+        first = self._text_position(index1)
+        last = max(first, self._text_position(index2))
+        inserted = chars + "".join(args[1::2])
+        index1 = "%d.%d" % (first[0] + 1, first[1])
+        self._replace(index1, "%d.%d" % (last[0] + 1, last[1]), chars, *args)
+        self._update_buffer(first[0], last[0] + 1, inserted.count("\n") + 1)
+        self.text.tag_add("TODO", index1, index1 + "+%dc" % len(inserted))
+
     def _modified(self, event=None):
         """Called when the text area is modified. Redraws lines numers and and recolorizes"""
         if not self.is_modifing:
-            self.is_modifiying = True
+            self.is_modifing = True
             self.updateLineNumbers()
-            self.colorize()
+            self.schedule_colorize()
             self.text.edit_modified(False)
             self.is_modifing = False
 
@@ -103,8 +227,7 @@ class CodeEditor(ttk.Frame):
 
     def _newline_indent_add(self, row):
         """is the defered portion of the newline_indent. Called after the text has added the new line"""
-        scanner = indent_scanner.IndentScanner(self["text"])
-        indent = scanner.get_new_indentation(row)
+        indent = self.scanner.get_new_indentation(row)
         self.text.insert("%d.0" % (row+1), " " * indent)
         line = self.text.get(tk.INSERT, tk.INSERT + " lineend")
         if len(line) - len(line.rstrip(' ')) != 0: # The line after the cursor is all whitespace. remove it.
@@ -115,25 +238,30 @@ class CodeEditor(ttk.Frame):
         self.text.insert(tk.INSERT, " " * 4)
         return 'break'
 
-    def replace_indents(self):
-        """replaces all indents with 4 spaces"""
-        text = self["text"]
-        text = text.replace("\t", " " * 4)
-        self["text"] = text
+    def getLineCount(self):
+        """returns the number of lines in the text, read from its end index"""
+        return int(self.text.index("end-1c").split('.')[0])
 
-    def getLineNumbers(self):
-        return "\n".join(map(str, range(len(self["text"].splitlines()))))
-
-    # This method is taken from http://tkinter.unpythonic.net/wiki/A_Text_Widget_with_Line_Numbers
     def updateLineNumbers(self):
+        """
+        makes the gutter show one number per line. Only the numbers that were
+        added or removed at the end are changed
+        """
         tt = self.linenums_text
-        ln = self.getLineNumbers()
-        if self.lineNumbers != ln:
-            self.lineNumbers = ln
-            tt.config(state="normal")
-            tt.delete("1.0", tk.END)
-            tt.insert("1.0", self.lineNumbers)
-            tt.config(state="disabled")
+        count = self.getLineCount()
+        if count == self.line_count:
+            return
+        tt.config(state="normal")
+        if count > self.line_count:
+            numbers = "\n".join(map(str, range(self.line_count, count)))
+            if self.line_count:
+                numbers = "\n" + numbers
+            tt.insert("end-1c", numbers)
+        else:
+            # removes the newline before the first removed number too
+            tt.delete("%d.0-1c" % (count + 1), "end-1c")
+        tt.config(state="disabled")
+        self.line_count = count
 
     def LoadTagDefs(self):
         #theme = idleConf.GetOption('main','Theme','name')
@@ -156,15 +284,55 @@ class CodeEditor(ttk.Frame):
 
         self.text.tag_raise("sel")
 
+    def schedule_colorize(self):
+        """
+        Colorizes the text in the background. A colorize that is already
+        scheduled is cancelled and started over, so new edits are seen first
+        """
+        if self.after_id is not None:
+            self.text.after_cancel(self.after_id)
+        self.after_id = self.text.after(1, self.recolorize)
+
+    def recolorize(self):
+        """
+        Colorizes at most lines_per_tick lines, starting with the lines that
+        are visible, and schedules itself again if there is anything left
+        """
+        self.after_id = None
+        first = self.text.index("@0,0 linestart")
+        last = self.text.index("@0,%d lineend +1c" % self.text.winfo_height())
+        scanned = self.colorize(first, last, self.lines_per_tick)
+        if scanned < self.lines_per_tick:
+            self.colorize("1.0", None, self.lines_per_tick - scanned)
+        if self.text.tag_nextrange("TODO", "1.0"):
+            self.after_id = self.text.after(1, self.recolorize)
+
+    def destroy(self):
+        if self.after_id is not None:
+            self.text.after_cancel(self.after_id)
+            self.after_id = None
+        super().destroy()
+
     # This is taken and modified from Python 3.5\Lib\idlelib\ColorDelegator.py
-    def colorize(self):
+    def colorize(self, start="1.0", end=None, max_lines=None):
         """
         Scan the text area and add color based on python syntax
+
+        Only text tagged TODO is scanned. Edits tag the changed range as TODO,
+        and scanning starts at the last SYNC (a newline outside of any string)
+        before the change. It stops at the first line end that was a SYNC
+        before and is still a SYNC after scanning, so the rest of the text is
+        known to be colored correctly already.
+
+        Only TODO ranges starting between start and end are scanned. Scanning
+        stops early at the first SYNC after max_lines lines have been scanned,
+        so a string is always scanned to its end. Returns the number of lines
+        scanned
         """
-        self.text.tag_add("TODO", "1.0", tk.END)
-        next = "1.0"
+        scanned = 0
+        next = start
         while True:
-            item = self.text.tag_nextrange("TODO", next)
+            item = self.text.tag_nextrange("TODO", next, end)
             if not item:
                 break
             head, tail = item
@@ -188,7 +356,8 @@ class CodeEditor(ttk.Frame):
                 line = self.text.get(mark, next)
                 if not line:
                     #print("Line is empty, returning")
-                    return
+                    return scanned
+                scanned += int(next.split('.')[0]) - int(mark.split('.')[0])
                 for tag in self.tagdefs:
                     self.text.tag_remove(tag, mark, next)
                 chars = chars + line
@@ -223,14 +392,18 @@ class CodeEditor(ttk.Frame):
                     # crumb telling the next invocation to resume here
                     # in case update tells us to leave.
                     self.text.tag_add("TODO", next)
-                #self.update()
-                #if self.stop_colorizing:
-                #    if DEBUG: print("colorizing stopped")
-                #    return
+                # only stop at a SYNC. A crumb left inside a string would
+                # make the next call start over before the string, and a
+                # string longer than max_lines would never be finished
+                if max_lines is not None and scanned >= max_lines and not chars:
+                    return scanned
+        return scanned
 
     def __getitem__(self, key):
         if key == "text":
-            return self.text.get("1.0", tk.END)
+            # the same as self.text.get("1.0", tk.END), which ends with a
+            # newline, without copying the text out of tk
+            return self.buffer.get_text() + "\n"
         else:
             super().__getitem__(key)
 
@@ -243,9 +416,63 @@ class CodeEditor(ttk.Frame):
             super().__setitem__(key, value)
             
 
-if __name__ == "__main__":
+def benchmark(sizes=(500, 5000, 20000), keystrokes=50):
+    """
+    Prints the average time to type one character, update the line numbers
+    and recolorize in the
+    middle of files of the given line counts
+    """
+    import time
+    root = tk.Tk()
+    line = 'label%d["text"] = "some text"  # a comment\n'
+    for size in sizes:
+        editor = CodeEditor(root)
+        editor["text"] = "".join(line % i for i in range(size))
+        editor.colorize()
+        row = size // 2
+        start = time.perf_counter()
+        for i in range(keystrokes):
+            editor.text.insert("%d.0" % row, "x")
+            editor.updateLineNumbers()
+            editor.colorize()
+        elapsed = time.perf_counter() - start
+        print("%6d lines: %.3f ms per keystroke" %
+              (size, elapsed / keystrokes * 1000))
+        editor.destroy()
+    root.destroy()
+
+
+def check_long_string(string_lines=500, max_ticks=100):
+    """
+    Checks that background colorizing finishes a file whose docstring is
+    longer than lines_per_tick, and colors the code after it
+    """
     root = tk.Tk()
     editor = CodeEditor(root)
-    editor.pack(side="top", fill="both", expand=True)
-    editor["text"] = "\"this is some\"\n#text"
-    root.mainloop()
+    editor["text"] = ('"""\n' + "docstring line\n" * string_lines + '"""\n' +
+                      "def foo():\n    return 1\n")
+    for tick in range(max_ticks):
+        if not editor.text.tag_nextrange("TODO", "1.0"):
+            break
+        editor.recolorize()
+    else:
+        raise AssertionError("colorizing did not finish in %d ticks" % max_ticks)
+    def_index = "%d.0" % (string_lines + 3)
+    assert "KEYWORD" in editor.text.tag_names(def_index)
+    print("a %d line string was colorized in %d ticks" % (string_lines, tick))
+    editor.destroy()
+    root.destroy()
+
+
+if __name__ == "__main__":
+    import sys
+    if "--benchmark" in sys.argv:
+        benchmark()
+    elif "--check" in sys.argv:
+        check_long_string()
+    else:
+        root = tk.Tk()
+        editor = CodeEditor(root)
+        editor.pack(side="top", fill="both", expand=True)
+        editor["text"] = "\"this is some\"\n#text"
+        root.mainloop()
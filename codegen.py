@@ -0,0 +1,330 @@
+"""
+    codegen.py
+
+    This file contains the code that turns the gui objects into python source.
+    Each widget writes its lines into a CodeWriter, which keeps them in a list
+    and joins them once at the end, or writes them straight to a file. Building
+    the source with str += copies everything written so far on every line,
+    which gets slow for large windows.
+"""
+import os
+import re
+import tempfile
+import guimodel
+import widget_types
+
+
+class CodeWriter:
+    """
+    Collects lines of source. Lines are indented by the current level, which
+    is changed with indent() and dedent() or with the indented() context.
+
+    If stream is given every line is written to it as soon as it is made, and
+    nothing is kept. Otherwise the lines are kept for getvalue().
+    """
+    def __init__(self, level=0, indent_size=4, stream=None):
+        self._parts = []
+        self._write = self._parts.append if stream is None else stream.write
+        self.indent_size = indent_size
+        self.level = level
+        self._prefix = " " * (level * indent_size)
+
+    def line(self, text=""):
+        """writes one line at the current indent. An empty line is not indented"""
+        if text:
+            self._write(self._prefix + text + "\n")
+        else:
+            self._write("\n")
+
+    def blank(self):
+        """writes an empty line"""
+        self._write("\n")
+
+    def write(self, text):
+        """writes text as it is, without indenting it"""
+        self._write(text)
+
+    def indent(self):
+        self.level += 1
+        self._prefix = " " * (self.level * self.indent_size)
+
+    def dedent(self):
+        self.level -= 1
+        self._prefix = " " * (self.level * self.indent_size)
+
+    def indented(self):
+        """returns a context that indents the lines written inside it"""
+        return _Indented(self)
+
+    def getvalue(self):
+        """
+        returns all the written source as one string. Is empty if the writer
+        has a stream
+        """
+        return "".join(self._parts)
+
+
+class _Indented:
+    def __init__(self, writer):
+        self.writer = writer
+
+    def __enter__(self):
+        self.writer.indent()
+        return self.writer
+
+    def __exit__(self, *exc_info):
+        self.writer.dedent()
+
+
+def save_command(cmd):
+    """
+    Given a str value for a command return the str that must be written in the
+    assignment value.
+
+    Basically adds lambda if we need to
+    """
+    if re.match(r".*\(.*\).*", cmd):
+        return "lambda: " + cmd
+    else:
+        return cmd
+
+
+def place_src(obj):
+    """returns the place call for the widget"""
+    return "%s.place(x=%s, y=%s, width=%s, height=%s)" % (
+        obj.name, obj.position.x, obj.position.y, obj.size.x, obj.size.y)
+
+
+def label_to_src(writer, label, associated_vars):
+    """writes the generated src for the label"""
+    name = label.name
+    writer.line("%s = Label(%s)" % (name, label.parent.name))
+    writer.line('%s["text"] = "%s"' % (name, label.text))
+    writer.line(place_src(label))
+    writer.blank()
+
+
+def button_to_src(writer, button, associated_vars):
+    """writes the generated src for the button"""
+    name = button.name
+    parent = button.parent.name
+    command = save_command(button.command)
+    if command:
+        writer.line("%s = Button(%s, command=%s)" % (name, parent, command))
+    else:
+        writer.line("%s = Button(%s)" % (name, parent))
+    writer.line('%s["text"] = "%s"' % (name, button.text))
+    writer.line(place_src(button))
+    writer.blank()
+
+
+def entry_to_src(writer, entry, associated_vars):
+    """
+    writes the generated src for the entry.
+    associated_vars is a set of already generated associated variables
+    """
+    name = entry.name
+    associated_variable = entry.associated_variable
+    validate_command = save_command(entry.validate_command)
+
+    if associated_variable and associated_variable not in associated_vars:
+        writer.line("%s = StringVar()" % associated_variable)
+        writer.blank()
+        associated_vars.add(associated_variable)
+    writer.line("%s = Entry(%s)" % (name, entry.parent.name))
+    writer.line('%s.insert(0, "%s")' % (name, entry.text))
+    if associated_variable:
+        writer.line('%s["textvariable"] = %s' % (name, associated_variable))
+    if entry.justify:
+        writer.line('%s["justify"] = "%s"' % (name, entry.justify))
+    if entry.show:
+        writer.line('%s["show"] = "%s"' % (name, entry.show))
+    if entry.validate:
+        writer.line('%s["validate"] = "%s"' % (name, entry.validate))
+    if validate_command:
+        writer.line('%s["validatecommand"] = %s' % (name, validate_command))
+    writer.line(place_src(entry))
+    writer.blank()
+
+
+def text_to_src(writer, text, associated_vars):
+    """writes the generated src for the text"""
+    writer.line("%s = Text(%s)" % (text.name, text.parent.name))
+    writer.line(place_src(text))
+    writer.blank()
+
+
+def canvas_to_src(writer, canvas, associated_vars):
+    """writes the generated src for the canvas"""
+    writer.line('%s = Canvas(%s, bg="%s")' % (canvas.name, canvas.parent.name,
+                                             canvas.bg))
+    writer.line(place_src(canvas))
+    writer.blank()
+
+
+def checkbutton_to_src(writer, checkbutton, associated_vars):
+    """
+    writes the generated src for the checkbutton.
+    associated_vars is a set of already generated associated variables
+    """
+    name = checkbutton.name
+    parent = checkbutton.parent.name
+    command = checkbutton.command
+    offvalue = checkbutton.offvalue
+    onvalue = checkbutton.onvalue
+    variable = checkbutton.variable
+    # to know if we should use StringVar or IntVar
+    isnumeric = onvalue.isnumeric() and offvalue.isnumeric()
+
+    if variable and variable not in associated_vars:
+        if isnumeric:
+            writer.line("%s = IntVar()" % variable)
+        else:
+            writer.line("%s = StringVar()" % variable)
+        associated_vars.add(variable)
+    if command:
+        writer.line("%s = Checkbutton(%s, command=%s)" % (name, parent,
+                                                          command))
+    else:
+        writer.line("%s = Checkbutton(%s)" % (name, parent))
+    writer.line('%s["text"] = "%s"' % (name, checkbutton.text))
+    if variable:
+        writer.line('%s["variable"] = %s' % (name, variable))
+    if onvalue:
+        if isnumeric:
+            writer.line('%s["onvalue"] = %s' % (name, onvalue))
+        else:
+            writer.line('%s["onvalue"] = "%s"' % (name, onvalue))
+    if offvalue:
+        if isnumeric:
+            writer.line('%s["offvalue"] = %s' % (name, offvalue))
+        else:
+            writer.line('%s["offvalue"] = "%s"' % (name, offvalue))
+    if checkbutton.takefocus:
+        writer.line('%s["takefocus"] = %s' % (name, checkbutton.takefocus))
+    writer.line(place_src(checkbutton))
+    writer.blank()
+
+
+def root_to_src(writer, _root, associated_vars):
+    """
+    writes the src to create the window. Returns the src to start mainloop,
+    which should be written after all other widgets
+    """
+    name = _root.name
+    writer.blank()
+    writer.line("%s = Tk()" % name)
+    writer.line('%s.title("%s")' % (name, _root.title))
+    writer.line('%s.geometry("%sx%s")' % (name, _root.size.x, _root.size.y))
+    writer.blank()
+    return "%s.mainloop()" % name
+
+
+def widget_to_src(writer, obj, associated_vars):
+    """
+    writes the src of any gui object. Returns the mainloop src if obj is the
+    window, else None
+    """
+    widget_type = widget_types.registry.get(obj)
+    if widget_type is None or widget_type.emitter is None:
+        return None
+    return widget_type.emitter(writer, obj, associated_vars)
+
+
+def write_initialize(writer, gui_objects):
+    """writes the initialize function that creates the gui objects"""
+    writer.line("def initialize():")
+    with writer.indented():
+        writer.line("global " + ", ".join(obj.name for obj in gui_objects))
+        associated_vars = set()
+        mainloop = None
+        for obj in gui_objects:
+            mainloop = widget_to_src(writer, obj, associated_vars) or mainloop
+        if mainloop:
+            writer.line(mainloop)
+
+
+def write_gui_src(writer, gui_objects, user_code, helper_code):
+    """
+    writes the source of the whole file: the user's code, the helper methods
+    and an initialize function that creates the gui objects
+    """
+    writer.write(user_code)
+    writer.write(helper_code)
+    writer.blank()
+    write_initialize(writer, gui_objects)
+    writer.line("initialize()")
+
+
+def gui_to_src(gui_objects, user_code, helper_code):
+    """returns the source of the whole file as a string"""
+    writer = CodeWriter()
+    write_gui_src(writer, gui_objects, user_code, helper_code)
+    return writer.getvalue()
+
+
+def splice_initialize(layout, gui_objects):
+    """
+    returns a guiparser.SourceLayout of the loaded file with only its
+    initialize function regenerated. Every other line is kept as it is
+    """
+    writer = CodeWriter()
+    write_initialize(writer, gui_objects)
+    return layout.replace_initialize(writer.getvalue())
+
+
+def save_atomically(filename, write):
+    """
+    calls write(file) with a temporary file in the same directory as
+    filename, which then replaces filename. A failed save never leaves a half
+    written file
+    """
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, temp_name = tempfile.mkstemp(prefix="." + name + ".", suffix=".tmp",
+                                     dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp makes the file readable only by the user, so give it the
+        # mode of the file it replaces, or the default one for a new file
+        try:
+            mode = os.stat(filename).st_mode
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, filename)
+    except BaseException:
+        try:
+            os.remove(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def save_gui_src(filename, gui_objects, user_code, helper_code):
+    """writes the source of the whole file to filename as it is generated"""
+    save_atomically(filename, lambda file: write_gui_src(
+        CodeWriter(stream=file), gui_objects, user_code, helper_code))
+
+
+def save_spliced_src(filename, layout, gui_objects):
+    """
+    writes the loaded file to filename with only its initialize function
+    regenerated. Returns the SourceLayout of what was written
+    """
+    layout = splice_initialize(layout, gui_objects)
+    save_atomically(filename, lambda file: file.writelines(layout.lines))
+    return layout
+
+
+widget_types.registry.register(guimodel.Window, emitter=root_to_src)
+widget_types.registry.register(guimodel.Button, emitter=button_to_src)
+widget_types.registry.register(guimodel.Label, emitter=label_to_src)
+widget_types.registry.register(guimodel.Entry, emitter=entry_to_src)
+widget_types.registry.register(guimodel.Checkbutton, emitter=checkbutton_to_src)
+widget_types.registry.register(guimodel.Text, emitter=text_to_src)
+widget_types.registry.register(guimodel.Canvas, emitter=canvas_to_src)
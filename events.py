@@ -0,0 +1,183 @@
+"""
+    events.py
+
+    This file contains EventBus, the event system used by the gui objects.
+    Listeners are subscribed to an event name and get a handle back, which
+    is used to unsubscribe them. Bound methods are only weakly referenced, so
+    a widget that listens to its parent's events does not keep itself alive
+    after it is deleted.
+"""
+import itertools
+import weakref
+
+
+class EventBus:
+    """
+    Holds the listeners of each event name.
+
+    Subscribing the same action to the same event twice gives back the first
+    handle instead of adding it again, so binding in a callback that runs
+    many times does not grow the listener list. Emitting passes the same
+    event object to every listener.
+    """
+    _next_handle = itertools.count(1)
+
+    def __init__(self):
+        # k -> event name, v -> dict of handle -> reference to the action
+        self._listeners = {}
+        # k -> event name, v -> dict of action key -> handle
+        self._keys = {}
+        self._handles = {}  # k -> handle, v -> (event name, action key)
+
+    @staticmethod
+    def _key(action):
+        """returns a key that is the same for equal actions"""
+        if hasattr(action, "__self__") and hasattr(action, "__func__"):
+            return (id(action.__self__), action.__func__)
+        return action
+
+    def subscribe(self, event, action):
+        """calls action(event_object) when the event is emitted. Returns a handle"""
+        key = self._key(action)
+        keys = self._keys.setdefault(event, {})
+        if key in keys:
+            return keys[key]
+        handle = next(self._next_handle)
+        if hasattr(action, "__self__") and hasattr(action, "__func__"):
+            # a bound method. Drop it when its object is garbage collected
+            reference = weakref.WeakMethod(
+                action, lambda ref, handle=handle: self.unsubscribe(handle))
+        else:
+            reference = lambda action=action: action
+        self._listeners.setdefault(event, {})[handle] = reference
+        keys[key] = handle
+        self._handles[handle] = (event, key)
+        return handle
+
+    def unsubscribe(self, handle):
+        """removes the listener with the handle. Does nothing if it is gone"""
+        if handle not in self._handles:
+            return
+        event, key = self._handles.pop(handle)
+        del self._keys[event][key]
+        del self._listeners[event][handle]
+        if not self._listeners[event]:
+            del self._listeners[event]
+            del self._keys[event]
+
+    def emit(self, event, event_object):
+        """calls every listener of the event with the event object"""
+        listeners = self._listeners.get(event)
+        if not listeners:
+            return
+        # a listener may unsubscribe while the event is being emitted
+        for reference in tuple(listeners.values()):
+            action = reference()
+            if action is not None:
+                action(event_object)
+
+    def listener_count(self, event):
+        """returns how many listeners the event has"""
+        return len(self._listeners.get(event, ()))
+
+    def clear(self):
+        """removes every listener"""
+        self._listeners.clear()
+        self._keys.clear()
+        self._handles.clear()
+
+    def __contains__(self, event):
+        """returns True if the event has any listeners"""
+        return event in self._listeners
+
+
+if __name__ == "__main__":
+    # Test code
+    # Selects gui objects over and over through the designer's on_selection,
+    # and checks that selecting never adds listeners. The model classes need
+    # no display. The tk root, the group drag and the widgets of the
+    # properties panel are replaced with objects that only record their values
+    import collections
+    import gc
+    import guimodel
+    import main_window
+
+    class Root:
+        def focus(self):
+            pass
+
+    class GroupDrag:
+        def cancel(self):
+            pass
+
+    class Frame:
+        def pack(self, **kwargs):
+            pass
+
+        def pack_forget(self):
+            pass
+
+    class Value:
+        def __init__(self):
+            self.value = ""
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            self.value = value
+
+    main_window.root = Root()
+    main_window.group_drag = GroupDrag()
+    main_window.property_entries = collections.defaultdict(
+        lambda: (Frame(), Value()))
+    panel = main_window.property_entries
+
+    window = guimodel.Window(name="root")
+    main_window.add_guiobj(window)
+    buttons = []
+    for i in range(20):
+        button = guimodel.Button(parent=window, name="button%d" % i,
+                                 position=guimodel.Vector(i * 10, 0),
+                                 size=guimodel.Vector(10, 10))
+        main_window.add_guiobj(button)
+        buttons.append(button)
+
+    names = ("selected", "dragged", "moved", "resized")
+    counts = {obj: [obj._events.listener_count(name) for name in names]
+              for obj in buttons}
+    assert counts[buttons[0]] == [1, 1, 2, 2]
+    for selection in range(1000):
+        first = buttons[selection % len(buttons)]
+        first._events.emit("selected", guimodel.SelectEvent(first, False))
+        assert main_window.selected_objects == [first]
+        # moving the selected widget shows its new position
+        delta = guimodel.Vector(1, 2)
+        first.position = first.position + delta
+        first._events.emit("moved", guimodel.MoveEvent(first, delta))
+        assert panel["X Position"][1].get() == first.position.x
+        assert panel["Y Position"][1].get() == first.position.y
+        # add two others to the selection. Their positions differ, so the
+        # panel shows them as mixed values, which stay mixed when one moves
+        for offset in (3, 7):
+            other = buttons[(selection + offset) % len(buttons)]
+            other._events.emit("selected", guimodel.SelectEvent(other, True))
+        assert len(main_window.selected_objects) == 3
+        first._events.emit("moved", guimodel.MoveEvent(first, delta))
+        assert panel["X Position"][1].get() == "\032"
+        for button in buttons:
+            assert [button._events.listener_count(name)
+                    for name in names] == counts[button]
+
+    # bound methods do not keep their object alive
+    class Listener:
+        def on_resized(self, event):
+            pass
+    listener = Listener()
+    buttons[0].bind_event("resized", listener.on_resized)
+    assert buttons[0]._events.listener_count("resized") == 3
+    del listener
+    gc.collect()
+    assert buttons[0]._events.listener_count("resized") == 2
+    print("listener counts stayed constant over 1000 selections of %d widgets"
+          % len(buttons))
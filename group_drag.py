@@ -0,0 +1,176 @@
+"""
+    group_drag.py
+
+    This file contains GroupDrag, which moves the selected widgets while one
+    of them is dragged. Motion events come in much faster than the screen is
+    redrawn, so only the last position of each frame is used. The whole
+    selection shares one canvas tag, so moving it is a single canvas.move no
+    matter how many widgets are selected.
+"""
+import GUIObj
+
+
+class GroupDrag:
+    """
+    Coalesces drag motion into at most one update per frame.
+
+    scheduler is any tk widget, it is only used for after(). Widgets must
+    have a canvas, a tag on that canvas that covers everything they draw,
+    a position, and shift_position(delta) which records a move that has
+    already been done on the canvas.
+    """
+    def __init__(self, scheduler, frame_ms=16, tag="selection"):
+        self.scheduler = scheduler
+        self.frame_ms = frame_ms
+        self.tag = tag
+        self.after_id = None
+        self._group = ()  # the widgets that currently have the tag
+        self._pending = None  # (dragged widget, position it was dragged to)
+        self.frames = 0  # how many updates were applied
+        self.tk_calls = 0  # how many tk calls the updates made
+
+    def drag(self, widget, position, group):
+        """
+        called for every motion event. Moves the group by the amount the
+        widget was dragged on the next frame
+        """
+        if widget not in group:
+            group = (widget,)
+        self._set_group(group)
+        self._pending = (widget, position)
+        if self.after_id is None:
+            self.after_id = self.scheduler.after(self.frame_ms, self.apply)
+
+    def _set_group(self, group):
+        """tags the widgets of the group. Only does work if the group changed"""
+        group = tuple(group)
+        if len(group) == len(self._group) and all(
+                a is b for a, b in zip(group, self._group)):
+            return
+        for widget in self._group:
+            widget.canvas.dtag(widget.tag, self.tag)
+        for widget in group:
+            widget.canvas.addtag_withtag(self.tag, widget.tag)
+        self._group = group
+
+    def apply(self):
+        """moves the group to the last dragged position"""
+        self.after_id = None
+        if self._pending is None or not self._group:
+            return
+        widget, position = self._pending
+        self._pending = None
+        dx, dy = self._clamp_delta(position.x - widget.position.x,
+                                   position.y - widget.position.y)
+        if dx == 0 and dy == 0:
+            return
+        self._group[0].canvas.move(self.tag, dx, dy)
+        self.tk_calls += 1
+        self.frames += 1
+        delta = GUIObj.Vector(dx, dy)
+        for obj in self._group:
+            obj.shift_position(delta)
+
+    def _clamp_delta(self, dx, dy):
+        """limits the delta so every widget of the group stays in its parent"""
+        for obj in self._group:
+            x = obj.position.x
+            y = obj.position.y
+            dx = max(dx, -x)
+            dy = max(dy, -y)
+            if isinstance(obj.parent, GUIObj.Sized):
+                size = obj.size if isinstance(obj, GUIObj.Sized) else GUIObj.Vector(0, 0)
+                dx = min(dx, obj.parent.size.x - size.x - x)
+                dy = min(dy, obj.parent.size.y - size.y - y)
+        return dx, dy
+
+    def cancel(self):
+        """drops any pending update and untags the group"""
+        if self.after_id is not None:
+            self.scheduler.after_cancel(self.after_id)
+            self.after_id = None
+        self._pending = None
+        self._set_group(())
+
+
+if __name__ == "__main__":
+    # Test code. Counts the tk calls made while dragging 200 widgets, using
+    # stand-ins for the canvas and the widgets so no display is needed
+    class CountingCanvas:
+        def __init__(self):
+            self.calls = 0
+
+        def move(self, tag, dx, dy):
+            self.calls += 1
+
+        def dtag(self, tag, deleted):
+            self.calls += 1
+
+        def addtag_withtag(self, tag, with_tag):
+            self.calls += 1
+
+    class Scheduler:
+        def __init__(self):
+            self.callbacks = []
+
+        def after(self, ms, callback):
+            self.callbacks.append(callback)
+            return len(self.callbacks)
+
+        def after_cancel(self, after_id):
+            pass
+
+        def next_frame(self):
+            callbacks, self.callbacks = self.callbacks, []
+            for callback in callbacks:
+                callback()
+
+    class Parent(GUIObj.Sized):
+        pass
+
+    class StandIn(GUIObj.Sized):
+        def __init__(self, canvas, parent, x, y):
+            super().__init__(size=GUIObj.Vector(50, 20))
+            self.canvas = canvas
+            self.parent = parent
+            self.tag = "guiobj%d" % id(self)
+            self.position = GUIObj.Vector(x, y)
+
+        def shift_position(self, delta):
+            self.position = self.position + delta
+
+    canvas = CountingCanvas()
+    scheduler = Scheduler()
+    parent = Parent(size=GUIObj.Vector(2000, 2000))
+    widgets = [StandIn(canvas, parent, 100 + i * 2, 100 + i * 3)
+               for i in range(200)]
+    group_drag = GroupDrag(scheduler)
+
+    frames = 60
+    events_per_frame = 8
+    x = 100
+    group_drag.drag(widgets[0], GUIObj.Vector(x, 100), widgets)
+    tagging_calls = canvas.calls
+    frame_calls = []
+    for frame in range(frames):
+        for event in range(events_per_frame):
+            x += 1
+            group_drag.drag(widgets[0], GUIObj.Vector(x, 100), widgets)
+        calls = canvas.calls
+        scheduler.next_frame()
+        frame_calls.append(canvas.calls - calls)
+    moved = x - 100
+    assert all(w.position.x == 100 + i * 2 + moved
+               for i, w in enumerate(widgets))
+    assert max(frame_calls) == 1
+    print("%d widgets, %d motion events over %d frames" %
+          (len(widgets), frames * events_per_frame, frames))
+    print("tk calls: %d to tag the selection once, at most %d per frame" %
+          (tagging_calls, max(frame_calls)))
+    print("ungrouped dragging would make %d canvas.move calls" %
+          (frames * events_per_frame * len(widgets)))
+
+    # the group stops at the edge of the parent instead of squashing
+    group_drag.drag(widgets[0], GUIObj.Vector(-500, 100), widgets)
+    scheduler.next_frame()
+    assert min(w.position.x for w in widgets) == 0
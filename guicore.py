@@ -0,0 +1,307 @@
+"""
+    guicore.py
+
+    This file contains the loading and saving of designed files. Nothing here
+    imports tkinter, so files can be loaded and saved without a display.
+
+    Loading reads each object created in a file's initialize function into the
+    keyword arguments of its gui object class. The caller decides what to
+    create from them: the designer creates its tk widgets, and tools that run
+    without a display create the guimodel classes with create_model().
+    Saving generates the source of the gui objects with codegen.
+"""
+import os
+import codegen
+import guimodel
+import guiparser
+import widget_types
+
+# Helper methods that are added to saved files. They are not shown in the code
+# editor when loading src code
+helper_methods = ["set_text", "get_text", "append_text", "popup",
+                  "ask_for_string", "ask_for_yes_no", "get_selected"]
+_helper_code = None  # the source of helpermethods.py, read when first needed
+
+
+def get_helper_code():
+    """returns the source of the helper methods added to saved files"""
+    global _helper_code
+    if _helper_code is None:
+        directory = os.path.dirname(os.path.abspath(__file__))
+        filename = os.path.join(directory, "helpermethods.py")
+        with open(filename, mode="r") as file:
+            _helper_code = file.read()
+    return _helper_code
+
+
+def get_source_layout(source):
+    """
+    returns the guiparser.SourceLayout of the source, with the helper methods
+    recorded
+    """
+    return guiparser.get_source_layout(source, guiparser.get_tree(source),
+                                       helper_methods)
+
+
+def load_command(cmd):
+    """
+    Given the value of a command attribute in an assignment on a guiobj, return
+    the appropriate string to represent it
+
+    This will make both lambdas and normal method names load to strings
+    """
+    if not isinstance(cmd, str):
+        return guiparser.get_lambda_value(cmd)
+    else:
+        return cmd
+
+
+def load_place(method_calls, properties):
+    """
+    sets position and size in properties from the place call in method_calls
+    """
+    position = guimodel.Vector(0, 0)
+    size = guimodel.Vector(0, 0)
+    if "place" in method_calls:
+        keywords = method_calls["place"].keywords
+        if "x" in keywords:
+            position = position.replace(x=int(keywords["x"]))
+        if "y" in keywords:
+            position = position.replace(y=int(keywords["y"]))
+        if "width" in keywords:
+            size = size.replace(x=int(keywords["width"]))
+        if "height" in keywords:
+            size = size.replace(y=int(keywords["height"]))
+    properties["position"] = position
+    properties["size"] = size
+
+
+def load_root(obj, assignments, method_calls):
+    """
+    returns the properties of the root object
+    """
+    # the Tk type should only be instantiated once and is represented by a
+    # window obj
+    title = ""
+    size = guimodel.Vector(800, 600)
+    # find the parameters for the window
+    # almost everything for window is in single argument method calls
+    if "title" in method_calls:
+        title = method_calls["title"].args[0]
+    if "geometry" in method_calls:
+        # geometry is given as a string formated as XPOSxYPOS ex: 600x800
+        # split it up and turn it into a vector
+        x = int(method_calls["geometry"].args[0].split("x")[0])
+        y = int(method_calls["geometry"].args[0].split("x")[1])
+        size = guimodel.Vector(x, y)
+    return {"title": title, "size": size}
+
+
+def load_button(obj, assignments, method_calls):
+    """
+    returns the properties of a button
+    """
+    properties = {"command": "", "text": ""}
+
+    if "command" in obj.keywords:
+        properties["command"] = load_command(obj.keywords["command"])
+    if "text" in obj.keywords:
+        properties["text"] = obj.keywords["text"]
+
+    for assignment in assignments:
+        if isinstance(assignment, guiparser.SubscriptAssignment):
+            if assignment.subscript == "text":
+                properties["text"] = assignment.value
+            elif assignment.subscript == "command":
+                properties["command"] = assignment.value
+
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_label(obj, assignments, method_calls):
+    """
+    returns the properties of a label
+    """
+    properties = {"text": ""}
+
+    if "text" in obj.keywords:
+        properties["text"] = obj.keywords["text"]
+
+    for assignment in assignments:
+        if isinstance(assignment, guiparser.SubscriptAssignment):
+            if assignment.subscript == "text":
+                properties["text"] = assignment.value
+
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_text(obj, assignments, method_calls):
+    """
+    returns the properties of a text
+    """
+    properties = {}
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_entry(obj, assignments, method_calls):
+    """
+    returns the properties of an entry
+    """
+    properties = {"text": "", "justify": "left", "show": "",
+                  "associated_variable": "", "validate": "",
+                  "validate_command": ""}
+
+    for word in obj.keywords:
+        if word == "text":
+            properties["text"] = obj.keywords["text"]
+        elif word == "justify":
+            justify = obj.keywords["justify"]
+            if justify == "tk.LEFT":
+                justify = "left"
+            elif justify == "tk.RIGHT":
+                justify = "right"
+            elif justify == "tk.CENTER":
+                justify = "center"
+            properties["justify"] = justify
+        elif word == "show":
+            properties["show"] = obj.keywords["show"]
+        elif word == "textvariable":
+            properties["associated_variable"] = obj.keywords["textvariable"]
+        elif word == "validate":
+            properties["validate"] = obj.keywords["validate"]
+        elif word == "validatecommand":
+            properties["validate_command"] = load_command(
+                obj.keywords["validatecommand"])
+
+    if "insert" in method_calls:
+        method = method_calls["insert"]
+        # assure that we're inserting at the very start
+        if method.args[0] == 0:
+            properties["text"] = method.args[1]
+        else:
+            print("Cannot insert text at any place other than 0")
+
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_checkbutton(obj, assignments, method_calls):
+    """
+    returns the properties of a checkbutton
+    """
+    properties = {"text": ""}
+
+    if "text" in obj.keywords:
+        properties["text"] = obj.keywords["text"]
+
+    for assignment in assignments:
+        if isinstance(assignment, guiparser.SubscriptAssignment):
+            if assignment.subscript == "text":
+                properties["text"] = assignment.value
+
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_canvas(obj, assignments, method_calls):
+    """
+    returns the properties of a canvas
+    """
+    properties = {"bg": ""}
+
+    if "bg" in obj.keywords:
+        properties["bg"] = obj.keywords["bg"]
+    for method_name in ["config", "configure"]:
+        if (method_name in method_calls and
+                "bg" in method_calls[method_name].keywords):
+            properties["bg"] = method_calls[method_name].keywords["bg"]
+
+    load_place(method_calls, properties)
+    return properties
+
+
+def load_gui(source, create):
+    """
+    loads the gui objects created in the initialize function of the source.
+    For each one, in the order they are created, create(widget_type, parent,
+    properties) is called and returns the new gui object. properties are the
+    keyword arguments read from the source, including the name. parent is
+    None for the window.
+    Returns a list of the created gui objects
+    """
+    objects = {}  # k -> object name, v -> created gui object
+    # initialize() is walked once and each object is looked up in the index.
+    # The index is cached, so a source that was already parsed is not parsed
+    # again
+    index = guiparser.get_initialize_index(source)
+    for obj in index.objects:
+        # make sense of the returned objects and create them
+        if obj.object_name in objects:
+            print()
+            print("Error when loading objects.")
+            print("%s is created more than once" % (obj.object_name))
+            continue
+        widget_type = widget_types.registry.get_by_source_name(obj.object_type)
+        if widget_type is None or widget_type.loader is None:
+            print()
+            print("Error when loading objects.")
+            print("Objects of type %s are not yet supported" %
+                  (obj.object_type))
+            continue
+        parent = None
+        if not issubclass(widget_type.model, guimodel.Window):
+            parent_name = obj.args[0] if obj.args else None
+            parent = objects.get(parent_name)
+            if parent is None:
+                print("Error when loading objects. cannot find parent of %s "
+                      "named %s" % (obj.object_name, parent_name))
+                continue
+        properties = widget_type.loader(
+            obj, index.get_assignments(obj.object_name),
+            index.get_method_calls(obj.object_name))
+        properties["name"] = obj.object_name
+        objects[obj.object_name] = create(widget_type, parent, properties)
+    return list(objects.values())
+
+
+def create_model(widget_type, parent, properties):
+    """creates the guimodel object of the widget type. See load_gui()"""
+    if parent is None:
+        return widget_type.model(**properties)
+    return widget_type.model(parent=parent, **properties)
+
+
+def load_models(source):
+    """returns the guimodel objects created in the initialize function of the source"""
+    return load_gui(source, create_model)
+
+
+def gui_to_src(gui_objects, user_code):
+    """returns the source of the whole file"""
+    return codegen.gui_to_src(gui_objects, user_code, get_helper_code())
+
+
+def save_gui(filename, gui_objects, user_code, layout=None):
+    """
+    saves the gui objects and the user's code to filename.
+    layout should only be given while the user's code is unchanged since the
+    file was loaded. It is the file's SourceLayout, and then only initialize()
+    is regenerated and the rest of the file is kept as it was. Returns the
+    SourceLayout of what was written in that case, else None
+    """
+    if layout is not None and layout.initialize is not None:
+        return codegen.save_spliced_src(filename, layout, gui_objects)
+    codegen.save_gui_src(filename, gui_objects, user_code, get_helper_code())
+    return None
+
+
+widget_types.registry.register(guimodel.Window, loader=load_root)
+widget_types.registry.register(guimodel.Button, loader=load_button)
+widget_types.registry.register(guimodel.Label, loader=load_label)
+widget_types.registry.register(guimodel.Entry, loader=load_entry)
+widget_types.registry.register(guimodel.Checkbutton, loader=load_checkbutton)
+widget_types.registry.register(guimodel.Text, loader=load_text)
+widget_types.registry.register(guimodel.Canvas, loader=load_canvas)
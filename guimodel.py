@@ -0,0 +1,275 @@
+"""
+    guimodel.py
+
+    This file contains the model of the gui objects: what each kind of widget
+    is and the properties it has, without showing it. GUIObj.py shows these
+    with tk. The model does not import tkinter, so files can be loaded and
+    saved without a display.
+"""
+import operator
+import events
+
+
+class Event:
+    def __init__(self, caller):
+        self.caller = caller
+
+
+class SelectEvent:
+    def __init__(self, caller, multiselect):
+        self.caller = caller
+        self.multiselect = multiselect
+
+
+class MoveEvent:
+    def __init__(self, caller, delta):
+        self.caller = caller
+        self.delta = delta
+
+
+class DragEvent:
+    def __init__(self, caller, position):
+        self.caller = caller
+        self.position = position
+
+
+class Vector(tuple):
+    """
+    Represents a position in 2d space
+
+    Vectors are immutable (x, y) tuples, so they can be shared, for example as
+    default arguments. The operators and helpers return new vectors. ==
+    compares the components like any other tuple.
+    """
+    __slots__ = ()
+
+    def __new__(cls, x, y):
+        return _new_tuple(cls, (x, y))
+
+    x = property(operator.itemgetter(0))
+    y = property(operator.itemgetter(1))
+
+    def __str__(self):
+        return "Vector: %f, %f" % self
+
+    def __repr__(self):
+        return "Vector(%r, %r)" % self
+
+    # The operators create the tuple directly instead of calling Vector(),
+    # which is noticeably faster for the many vectors made while dragging
+    def __add__(self, other):
+        x, y = self
+        other_x, other_y = other
+        return _new_tuple(Vector, (x + other_x, y + other_y))
+
+    def __sub__(self, other):
+        x, y = self
+        other_x, other_y = other
+        return _new_tuple(Vector, (x - other_x, y - other_y))
+
+    def __mul__(self, scalar):
+        x, y = self
+        return _new_tuple(Vector, (x * scalar, y * scalar))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scalar):
+        x, y = self
+        return _new_tuple(Vector, (x / scalar, y / scalar))
+
+    def __neg__(self):
+        x, y = self
+        return _new_tuple(Vector, (-x, -y))
+
+    def replace(self, x=None, y=None):
+        """returns the vector with the given components replaced"""
+        return Vector(self[0] if x is None else x,
+                      self[1] if y is None else y)
+
+    def clamp(self, low=None, high=None):
+        """
+        returns the vector with each component limited to the components of
+        low and high, which can be any (x, y) pairs. low wins if they overlap.
+        Either can be None
+        """
+        x, y = self
+        if high is not None:
+            high_x, high_y = high
+            if x > high_x:
+                x = high_x
+            if y > high_y:
+                y = high_y
+        if low is not None:
+            low_x, low_y = low
+            if x < low_x:
+                x = low_x
+            if y < low_y:
+                y = low_y
+        if x is self[0] and y is self[1]:
+            return self
+        return _new_tuple(Vector, (x, y))
+
+
+_new_tuple = tuple.__new__
+
+
+class Sized:
+    """Represents an object with a size"""
+    def __init__(self, size=Vector(0, 0), **kwargs):
+        super().__init__(**kwargs)
+        self.size = size
+
+
+class GUIObj:
+    """Represents the most basic gui object"""
+    def __init__(self, name="", class_variable=False, **kwargs):
+        # What is class_variable? Wether or not it is a global maybe?
+        self.name = name
+        self.class_variable = class_variable
+        self._events = events.EventBus()
+
+    def bind_event(self, event, action):
+        """
+        Binds the action to the event. Returns a handle for unbind_event.
+        Binding the same action again returns the same handle
+        """
+        return self._events.subscribe(event, action)
+
+    def unbind_event(self, handle):
+        """Removes the action bound with the handle"""
+        self._events.unsubscribe(handle)
+
+
+class Container(GUIObj):
+    """A gui obj that can contain Widgets"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.__children = set()
+
+    def add_child(self, child):
+        """Add the given child Widget"""
+        self.__children.add(child)
+
+    def remove_child(self, child):
+        """Removes the given child widget"""
+        self.__children.remove(child)
+
+    def children(self):
+        """Returns a list of current children"""
+        return list(self.__children)
+
+
+class Window(Container, Sized):
+    """Represents a window on the screen. Is a Container for other widgets"""
+    def __init__(self, title="", size=Vector(600, 800), **kwargs):
+        super().__init__(**kwargs)
+        self.title = title
+        self.size = size
+
+    @property
+    def name(self):
+        return "root"
+        
+    @name.setter
+    def name(self, value):
+        pass # don't set name.
+        # Todo: Make this error so we can see where name setting logic is wrong
+
+
+
+class Widget(GUIObj):
+    """Represents all tk widgets. Must be a child of a container."""
+    def __init__(self, parent=None, **kwargs):
+        super().__init__(**kwargs)
+        self.parent = parent
+        self.parent.add_child(self)
+
+
+class MovableWidget(Widget):
+    """A Widget that has a position"""
+    def __init__(self, position=Vector(0, 0), **kwargs):
+        super().__init__(**kwargs)
+        self.position = position
+
+
+class SizableWidget(Widget):
+    """
+    A Widget that has a size
+    Must implement resized event
+    """
+    def __init__(self, size=Vector(0, 0), **kwargs):
+        super().__init__(size=size, **kwargs)
+        self.size = size
+
+
+class Font:
+    """Represents a font family"""
+    pass
+
+
+class TextContainer:
+    """Represents a widget that contains text"""
+    def __init__(self, text="", font=Font(), **kwargs):
+        super().__init__(**kwargs)
+        self.text = text
+        self.font = font
+
+
+class Frame(Container, MovableWidget, SizableWidget):
+    """Represents a tk.Frame"""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+class Button(TextContainer, MovableWidget, SizableWidget):
+    def __init__(self, command="", **kwargs):
+        """
+        @type canvas: tk.Canvas
+        """
+        super().__init__(**kwargs)
+        self.command = command
+
+
+class Label(TextContainer, MovableWidget, SizableWidget):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+
+class Canvas(MovableWidget, SizableWidget):
+    def __init__(self, bg="white", **kwargs):
+        super().__init__(**kwargs)
+        self.bg = bg
+
+
+class Checkbutton(Label):
+    def __init__(self, command="", offvalue="", onvalue="", takefocus=True,
+                 variable="", size=Vector(90, 20), text="Checkbutton",
+                 **kwargs):
+        super().__init__(command=command, offvalue=offvalue, onvalue=onvalue,
+                         takefocus=takefocus, variable=variable, size=size,
+                         text=text, **kwargs)
+        self.command = command
+        self.offvalue = offvalue
+        self.onvalue = onvalue
+        self.takefocus = takefocus
+        self.variable = variable
+
+
+class Entry(TextContainer, MovableWidget, SizableWidget):
+    def __init__(self, justify="left", show="", validate="",
+                 validate_command="", associated_variable="",
+                 size=Vector(90, 20), **kwargs):
+        super().__init__(size=size, **kwargs)
+        self.justify = justify
+        # indicates what character to replace with for password fields
+        self.show = show
+        self.associated_variable = associated_variable
+        # when to validate
+        # http://infohost.nmt.edu/tcc/help/pubs/tkinter/web/entry-validation.html
+        self.validate = validate
+        self.validate_command = validate_command
+
+
+class Text(MovableWidget, SizableWidget):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
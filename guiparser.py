@@ -24,6 +24,9 @@
 # need it.
 
 import ast
+import collections
+import hashlib
+import io
 import astpp
 
 
@@ -150,67 +153,19 @@ def get_method_calls(function_node, object_name):
     """
     calls = {}
     for node in ast.walk(function_node):
-        # These series of if's check that the node is an assignment node that
-        # follows the pattern:
-        # object_name.attribute(arg, otherarg, finalarg, keyword=keywordarg, keyword2=otherkeywordarg)
-        if isinstance(node, ast.Expr):
-            expression = node
-            if isinstance(expression.value, ast.Call):
-                  call = expression.value
-                  if isinstance(call.func, ast.Attribute):
-                      attribute = call.func # this is a type not the name of the attribute
-                      if isinstance(attribute.value, ast.Name):
-                          name = attribute.value
-                          if name.id == object_name:
-                              attr = attribute.attr # attr is the actual atribute name the name of the method called
-                              raw_args = call.args
-                              args = []
-                              for arg in raw_args:
-                                  args.append(convert_arg(arg))
-
-                              keyword_args = {}
-                              keywords = call.keywords
-                              for keyword in keywords:
-                                  key = keyword.arg
-                                  raw_value = keyword.value
-                                  value = convert_arg(raw_value)
-                                  keyword_args[key] = value
-
-                              call = MethodCall(object_name=object_name, method_name=attr, args=args, keywords=keyword_args)
-                                  
-                              calls[attr] = call                     
+        call = match_method_call(node)
+        if call is not None and call.object_name == object_name:
+            calls[call.method_name] = call
     return calls
 
 
 def get_assignments(function_node, object_name):
     """returns a list of Assignment objects for the given object_name in the given function_node"""
-
-    # This only supports simple assignments such as "name.attr = value" or "name[index] = value". Other
-    # assignments will either throw an exception or not return the correct thing.
-    # This code could be modified to allow for more robust statements but I kept it simple because the
-    # code should already be formatted for these conditions.
     assignments = []
     for node in ast.walk(function_node):
-        if isinstance(node, ast.Assign):
-            assign = node
-            if isinstance(assign.targets[0], ast.Subscript):
-                subscript = assign.targets[0]
-                if isinstance(subscript.value, ast.Name):
-                    name = subscript.value.id # This is the ast.Name related to the object_name
-                    if name == object_name:
-                        subscript_value = convert_literal_node(subscript.slice.value)
-                        value = convert_literal_node(assign.value)
-                        new_assignment = SubscriptAssignment(object_name=object_name, subscript=subscript_value, value=value)
-                        assignments.append(new_assignment)
-            elif isinstance(assign.targets[0], ast.Attribute):
-                attribute = assign.targets[0]
-                if isinstance(attribute.value, ast.Name):
-                    name = attribute.value.id # This is the ast.Name related to the object_name
-                    if name == object_name:
-                        attribute_name = attribute.attr
-                        attribute_value = convert_literal_node(assign.value)
-                        new_assignment = AttributeAssignment(object_name=object_name, attribute=attribute_name, value=attribute_value)
-                        assignments.append(new_assignment)
+        assignment = match_assignment(node)
+        if assignment is not None and assignment.object_name == object_name:
+            assignments.append(assignment)
     return assignments
 
 
@@ -218,40 +173,206 @@ def get_objects(function_node):
     """
     returns a list of ObjectInstantiaions in order from first to last instantiated
     """
-
     objects = []
-
-    # This simply looks for an assignment statement that assigns a call to a Name to a target of a Name
     for node in ast.walk(function_node):
-        if isinstance(node, ast.Assign):
-            assign = node
-            if isinstance(assign.targets[0], ast.Name):
-                target = assign.targets[0]
-                object_name = target.id
-                if isinstance(assign.value, ast.Call):
-                    call = assign.value
-                    if isinstance(call.func, ast.Name):
-                        name = call.func # This refers to the ast.Name node, not the name of the object
-                        object_type = name.id
-
-                        raw_args = call.args
-                        args = []
-                        for arg in raw_args:
-                            args.append(convert_arg(arg))
-
-                        keyword_args = {}
-                        keywords = call.keywords
-                        for keyword in keywords:
-                            key = keyword.arg
-                            raw_value = keyword.value
-                            value = convert_arg(raw_value)
-                            keyword_args[key] = value
-                        
-                        new_object = ObjectInstantiation(object_name=object_name, object_type=object_type, args=args, keywords=keyword_args)
-                        objects.append(new_object)
+        instantiation = match_instantiation(node)
+        if instantiation is not None:
+            objects.append(instantiation)
     return objects
 
 
+class ObjectIndex:
+    """
+    Holds every instantiation, assignment and method call found in a function node, keyed by object name.
+    Looking up the assignments or method calls of one object is a dict lookup instead of another walk of the tree.
+    """
+    def __init__(self):
+        self.objects = []  # ObjectInstantiations in order from first to last instantiated
+        self.assignments = {}  # k -> object name, v -> list of Assignments
+        self.method_calls = {}  # k -> object name, v -> dict of method name to MethodCall
+
+    def get_assignments(self, object_name):
+        """returns a list of Assignment objects for the given object_name"""
+        return self.assignments.get(object_name, [])
+
+    def get_method_calls(self, object_name):
+        """returns a dictionary of method name to MethodCall for the given object_name. See get_method_calls()"""
+        return self.method_calls.get(object_name, {})
+
+
+def get_object_index(function_node):
+    """
+    returns an ObjectIndex of the given function node. The node is only walked once, so this should be used
+    instead of calling get_assignments() and get_method_calls() for every object returned by get_objects()
+    """
+    index = ObjectIndex()
+    for node in ast.walk(function_node):
+        instantiation = match_instantiation(node)
+        if instantiation is not None:
+            index.objects.append(instantiation)
+            continue
+        assignment = match_assignment(node)
+        if assignment is not None:
+            index.assignments.setdefault(assignment.object_name, []).append(assignment)
+            continue
+        call = match_method_call(node)
+        if call is not None:
+            # Like get_method_calls() only the last call of a method name is kept
+            index.method_calls.setdefault(call.object_name, {})[call.method_name] = call
+    return index
+
+
+def split_lines(source):
+    """
+    returns the lines of the source with their line endings. Only \n, \r\n and \r end a line, as they are the only
+    line endings ast counts in lineno. str.splitlines() also splits on form feeds and other separators
+    """
+    return io.StringIO(source, newline="").readlines()
+
+
+class SourceLayout:
+    """
+    The lines of a source file and where the designer's code is in them. Spans are (first, last) line numbers,
+    counted from 1 and inclusive like the lineno and end_lineno of ast nodes.
+    initialize is the span of the initialize function and initialize_call is the span of the top level
+    initialize() call, or None if the file has none. helpers is a list of the spans of the helper methods.
+    """
+    def __init__(self, lines, initialize=None, initialize_call=None, helpers=()):
+        self.lines = lines  # lines of the file, with their line endings
+        self.initialize = initialize
+        self.initialize_call = initialize_call
+        self.helpers = list(helpers)
+
+    def get_user_code(self):
+        """returns the source with the initialize function, its call and the helper methods left out"""
+        skipped = set()
+        for span in [self.initialize, self.initialize_call] + self.helpers:
+            if span is not None:
+                skipped.update(range(span[0] - 1, span[1]))
+        return "".join(line for i, line in enumerate(self.lines) if i not in skipped).rstrip()
+
+    def replace_initialize(self, initialize_src):
+        """
+        returns a SourceLayout of the source with the initialize function replaced by initialize_src.
+        Every other line is kept as it is
+        """
+        first, last = self.initialize
+        new_lines = split_lines(initialize_src)
+        shift = len(new_lines) - (last - first + 1)
+
+        def moved(span):
+            if span is None or span[0] < first:
+                return span
+            return (span[0] + shift, span[1] + shift)
+        return SourceLayout(self.lines[:first - 1] + new_lines + self.lines[last:],
+                            (first, first + len(new_lines) - 1),
+                            moved(self.initialize_call),
+                            [moved(span) for span in self.helpers])
+
+
+def get_node_span(node):
+    """returns the (first, last) lines of a top level node, including its decorators"""
+    first = node.lineno
+    for decorator in getattr(node, "decorator_list", ()):
+        first = min(first, decorator.lineno)
+    return (first, node.end_lineno)
+
+
+def get_source_layout(source, tree, helper_names=()):
+    """
+    returns a SourceLayout of the source, which tree was parsed from. Only the top level of the module is looked at.
+    helper_names are the names of the functions to record as helper methods
+    """
+    layout = SourceLayout(split_lines(source))
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            if node.name == "initialize" and layout.initialize is None:
+                layout.initialize = get_node_span(node)
+            elif node.name in helper_names:
+                layout.helpers.append(get_node_span(node))
+        elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) and
+              isinstance(node.value.func, ast.Name) and node.value.func.id == "initialize" and
+              not node.value.args and not node.value.keywords):
+            layout.initialize_call = get_node_span(node)
+    return layout
+
+def match_method_call(node):
+    """returns a MethodCall if the node is an expression calling a method on a name, otherwise None"""
+    # These series of if's check that the node is an expression node that
+    # follows the pattern:
+    # object_name.attribute(arg, otherarg, finalarg, keyword=keywordarg, keyword2=otherkeywordarg)
+    if isinstance(node, ast.Expr):
+        expression = node
+        if isinstance(expression.value, ast.Call):
+            call = expression.value
+            if isinstance(call.func, ast.Attribute):
+                attribute = call.func # this is a type not the name of the attribute
+                if isinstance(attribute.value, ast.Name):
+                    object_name = attribute.value.id
+                    attr = attribute.attr # attr is the actual atribute name the name of the method called
+                    args = convert_args(call)
+                    keyword_args = convert_keywords(call)
+                    return MethodCall(object_name=object_name, method_name=attr, args=args, keywords=keyword_args)
+    return None
+
+
+def match_assignment(node):
+    """returns a SubscriptAssignment or AttributeAssignment if the node assigns to one, otherwise None"""
+
+    # This only supports simple assignments such as "name.attr = value" or "name[index] = value". Other
+    # assignments will either throw an exception or not return the correct thing.
+    # This code could be modified to allow for more robust statements but I kept it simple because the
+    # code should already be formatted for these conditions.
+    if isinstance(node, ast.Assign):
+        assign = node
+        if isinstance(assign.targets[0], ast.Subscript):
+            subscript = assign.targets[0]
+            if isinstance(subscript.value, ast.Name):
+                object_name = subscript.value.id # This is the ast.Name related to the object_name
+                subscript_value = convert_literal_node(subscript.slice.value)
+                value = convert_literal_node(assign.value)
+                return SubscriptAssignment(object_name=object_name, subscript=subscript_value, value=value)
+        elif isinstance(assign.targets[0], ast.Attribute):
+            attribute = assign.targets[0]
+            if isinstance(attribute.value, ast.Name):
+                object_name = attribute.value.id # This is the ast.Name related to the object_name
+                attribute_name = attribute.attr
+                attribute_value = convert_literal_node(assign.value)
+                return AttributeAssignment(object_name=object_name, attribute=attribute_name, value=attribute_value)
+    return None
+
+
+def match_instantiation(node):
+    """returns an ObjectInstantiation if the node assigns a call to a Name to a target of a Name, otherwise None"""
+    if isinstance(node, ast.Assign):
+        assign = node
+        if isinstance(assign.targets[0], ast.Name):
+            target = assign.targets[0]
+            object_name = target.id
+            if isinstance(assign.value, ast.Call):
+                call = assign.value
+                if isinstance(call.func, ast.Name):
+                    name = call.func # This refers to the ast.Name node, not the name of the object
+                    object_type = name.id
+                    args = convert_args(call)
+                    keyword_args = convert_keywords(call)
+                    return ObjectInstantiation(object_name=object_name, object_type=object_type, args=args, keywords=keyword_args)
+    return None
+
+
+def convert_args(call_node):
+    """converts the positional arguments of a call node to a list of usable values"""
+    return [convert_arg(arg) for arg in call_node.args]
+
+
+def convert_keywords(call_node):
+    """converts the keyword arguments of a call node to a dict of usable values"""
+    keyword_args = {}
+    for keyword in call_node.keywords:
+        keyword_args[keyword.arg] = convert_arg(keyword.value)
+    return keyword_args
+
+
 def convert_literal_node(node):
     """converts literal ast node values into the python value. Returns the original value if it cannot be converted"""
     if isinstance(node, ast.Num):
@@ -284,11 +405,78 @@ def convert_arg(node):
         return convert_literal_node(node)
 
 
+class ParseCache:
+    """
+    A least recently used cache of parsed trees and their initialize() object indexes, keyed by a hash of the
+    source. Loading the same source again, like reopening a file or switching render modes, skips parsing.
+    At most maxsize sources are kept, and at most max_bytes of source text in total. Cached trees are shared, so
+    they must not be changed.
+    """
+    def __init__(self, maxsize=16, max_bytes=4 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0  # total size of the cached sources
+        # k -> hash of the source, v -> [tree, object index or None, size of the source]
+        self._entries = collections.OrderedDict()
+
+    def _get_entry(self, source):
+        data = source.encode("utf-8", "surrogatepass")
+        key = hashlib.sha1(data).digest()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        entry = [ast.parse(source), None, len(data)]
+        if entry[2] <= self.max_bytes:
+            self._entries[key] = entry
+            self._bytes += entry[2]
+            while len(self._entries) > self.maxsize or self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][2]
+        return entry
+
+    def get_tree(self, source):
+        """returns the tree of nodes of the source"""
+        return self._get_entry(source)[0]
+
+    def get_object_index(self, source):
+        """returns the ObjectIndex of the initialize function in the source"""
+        entry = self._get_entry(source)
+        if entry[1] is None:
+            entry[1] = get_object_index(get_initialize(entry[0]))
+        return entry[1]
+
+    def info(self):
+        """returns a dict of the hits, misses, number of cached sources and their total size"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "bytes": self._bytes,
+                "maxsize": self.maxsize, "max_bytes": self.max_bytes}
+
+    def clear(self):
+        """removes every cached tree and resets the counters"""
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+
+parse_cache = ParseCache()
+
+
 def get_tree(source):
     """
-    returns the tree of nodes from the source file
+    returns the tree of nodes from the source file. Trees are cached, see ParseCache
     """
-    return ast.parse(source)
+    return parse_cache.get_tree(source)
+
+
+def get_initialize_index(source):
+    """
+    returns the ObjectIndex of the initialize function in the source file. Indexes are cached, see ParseCache
+    """
+    return parse_cache.get_object_index(source)
 
 
 if __name__ == "__main__":
@@ -380,3 +568,26 @@ def foobar():
 
     #astpp.parseprint(source)
 
+
+    # a source that was already parsed is not parsed again
+    import timeit
+    cache = ParseCache(maxsize=2)
+    big_source = source.replace("def initialize():", "def initialize():\n" + "    x = 1\n" * 20000)
+    parse_time = timeit.timeit(lambda: ast.parse(big_source), number=5) / 5
+    cache.get_object_index(big_source)
+    cached_time = timeit.timeit(lambda: cache.get_object_index(big_source), number=5) / 5
+    for other in ("a = 1", "b = 2"):
+        cache.get_tree(other)
+    cache.get_tree(big_source)  # pushed out by the two newer sources
+    print()
+    print(cache.info())
+    print("parse: %.2f ms, cached: %.4f ms" % (parse_time * 1000, cached_time * 1000))
+
+    # a form feed above initialize() is not a line ending for ast, so it must not shift the spans
+    paged_source = "a = 1\n\x0c\nb = 2  \x0c# page two\n\ndef initialize():\n    pass\n\ninitialize()\n"
+    layout = get_source_layout(paged_source, ast.parse(paged_source))
+    assert layout.get_user_code() == "a = 1\n\x0c\nb = 2  \x0c# page two"
+    spliced = layout.replace_initialize("def initialize():\n    x = 1\n")
+    assert "".join(spliced.lines) == paged_source.replace("    pass", "    x = 1")
+    ast.parse("".join(spliced.lines))
+    print("form feed layout ok")
@@ -1,16 +1,162 @@
 import re
+import text_buffer
 
 # The regexes in this file are taken from Python3.5\Lib\idlelib\PyParse.py
 # This file is inspired by PyParse.py
 
+# the start state of a line that has not been scanned yet
+_UNSCANNED = object()
+# the lexer state outside of any string or bracket. See scan_line()
+EMPTY_STATE = (None, ())
+
+# Matches the tokens that change the lexer state outside of a string. Single
+# quoted strings are matched whole so quotes and brackets inside of them are
+# skipped. Unclosed single quoted strings end at the end of the line
+tokenre = re.compile(r"""
+    (?P<TRIPLE> '''|\"\"\" )
+|   (?P<STRING>
+        '[^'\\\n]*(?:\\.[^'\\\n]*)*'?
+    |   "[^"\\\n]*(?:\\.[^"\\\n]*)*"?
+    )
+|   (?P<COMMENT> \# )
+|   (?P<OPEN> [(\[{] )
+|   (?P<CLOSE> [)\]}] )
+""", re.VERBOSE)
+
+# Matches the rest of a triple quoted string up to and including the closing
+# quote, keyed by the quote
+string_endre = {
+    "'''": re.compile(r"(?:[^'\\]|\\.|'(?!''))*'''"),
+    '"""': re.compile(r'(?:[^"\\]|\\.|"(?!""))*"""'),
+}
+
+# Matches whole strings and comments in a block of text, so that everything
+# else is skipped over by the regex. The OPEN group matches a triple quoted
+# string that is still open at the end of the text
+stringre = re.compile(r"""
+    (?s: '''(?:[^'\\]|\\.|'(?!''))*'''
+    |    \"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"
+    )
+|   (?P<OPEN>
+        (?s: '''(?:[^'\\]|\\.?|'(?!''))*\Z
+        |    \"\"\"(?:[^"\\]|\\.?|"(?!""))*\Z
+        )
+    )
+|   '[^'\\\n]*(?:\\.[^'\\\n]*)*'?
+|   "[^"\\\n]*(?:\\.[^"\\\n]*)*"?
+|   \#[^\n]*
+""", re.VERBOSE)
+
+openerre = re.compile(r"""
+    ^
+    [ \t]*
+    (?: while
+    |   if
+    |   else
+    |   def
+    |   return
+    |   assert
+    |   break
+    |   class
+    |   continue
+    |   elif
+    |   try
+    |   except
+    |   raise
+    |   import
+    |   yield
+    )
+    \b
+""", re.VERBOSE | re.MULTILINE)
+
+closerre = re.compile(r"""
+    \s*
+    (?: return
+    |   break
+    |   continue
+    |   raise
+    |   pass
+    )
+    \b
+""", re.VERBOSE)
+
+
 class IndentScanner:
+    """
+    Finds the indentation for new lines.
+
+    The lexer state at the end of every line (whether it is inside a triple
+    quoted string, which quote, and the open brackets) is cached. A line's
+    state is only scanned again when the line is replaced through
+    replace_lines() or when the state at the end of the line before it
+    changes, so asking for the indentation of a line near the last edit does
+    not rescan the file.
+
+    text is either a string or a TextBuffer. The lines of a TextBuffer are
+    shared instead of copied, and the scanner follows its edits.
+    """
     def __init__(self, text):
-        self.text = text
-        self.lines = []
-        self._load_lines(text)
+        # _starts[i] and _ends[i] are the lexer states at the start and end of
+        # line i when it was last scanned
+        self._starts = []
+        self._ends = []
+        # the first line whose cached state has not been checked since the
+        # last edit
+        self._valid = 0
+        if isinstance(text, text_buffer.TextBuffer):
+            self.buffer = text
+        else:
+            self.buffer = text_buffer.TextBuffer()
+        self.lines = self.buffer.lines
+        self._starts[:] = [_UNSCANNED] * len(self.lines)
+        self._ends[:] = [None] * len(self.lines)
+        self.buffer.bind(self.lines_replaced)
+        if not isinstance(text, text_buffer.TextBuffer):
+            self._load_lines(text)
+
     def _load_lines(self, text):
-        for line in self.text.splitlines():
-            self.lines.append(line)
+        self.replace_lines(0, len(self.lines), text.splitlines())
+
+    def lines_replaced(self, first, last, count):
+        """called after lines first up to (not including) last were replaced with count lines"""
+        self._starts[first:last] = [_UNSCANNED] * count
+        self._ends[first:last] = [None] * count
+        self._valid = min(self._valid, first)
+
+    def replace_lines(self, first, last, new_lines):
+        """replaces lines first up to (not including) last with new_lines"""
+        self.buffer.replace_lines(first, last, new_lines)
+
+    def insert(self, line, column, chars):
+        """inserts chars at the given line and column"""
+        self.buffer.insert(line, column, chars)
+
+    def delete(self, first_line, first_column, last_line, last_column):
+        """deletes the text from the first line and column up to (not including) the last line and column"""
+        self.buffer.delete(first_line, first_column, last_line, last_column)
+
+    def get_state(self, index):
+        """returns the lexer state at the end of the line. See scan_line()"""
+        # Walk forward from the last checked line. Lines whose start state
+        # has not changed keep their cached end state, so usually only the
+        # edited lines are scanned
+        while self._valid <= index:
+            i = self._valid
+            start = self._ends[i-1] if i > 0 else EMPTY_STATE
+            if self._starts[i] != start:
+                self._starts[i] = start
+                self._ends[i] = scan_line(self.lines[i], start)
+            self._valid += 1
+        return self._ends[index]
+
+    def in_string(self, index):
+        """returns True if a multiline string is opened and NOT closed at the end of the line"""
+        return self.get_state(index)[0] is not None
+
+    def continues(self, index):
+        """returns True if the statement on the line continues on the next line in a string or brackets"""
+        quote, brackets = self.get_state(index)
+        return quote is not None or len(brackets) > 0
 
     def get_new_indentation(self, index):
         """gets new indentation for a line based on previous lines"""
@@ -25,31 +171,35 @@ class IndentScanner:
                 i -= 1
             else:
                 break
-        line = self.get_line(i)
-        if match_open_string("\n".join(self.lines[0:i+1])):
+        quote, brackets = self.get_state(i)
+        if quote is not None:
             # if the string is open then we let the indent level be 0
             return 0
-        # We have to keep looking backwards for the last line that was not the end of a string
-        # This can be done by removing the last line and checking if there is now an open string
-        while i > 1:
-            if match_open_string("\n".join(self.lines[0:i])):
-                i -= 1
+        if brackets:
+            # continuation lines line up with the innermost open bracket
+            return brackets[-1][1]
+        # We have to keep looking backwards for the line the statement started on
+        # The statement may continue over several lines in strings or brackets
+        start = i
+        while start > 0:
+            if self.continues(start-1):
+                start -= 1
             else:
                 break
-        line = self.get_line(i)
+        statement = " ".join(self.lines[start:i+1])
         # now the index is gauranteed to be at a useful spot.
-        if match_opener(line):
+        if match_opener(statement):
             # openers cause an indent level to be added
-            return self.get_line_indent(i) + 4
-        elif match_closer(line):
+            return self.get_line_indent(start) + 4
+        elif match_closer(statement):
             # closers cause an indent level to be removed
-            indent = self.get_line_indent(i)
+            indent = self.get_line_indent(start)
             if indent >= 4:
                 return indent - 4
             else:
                 return 0
         # The last line was just a normal statement
-        return self.get_line_indent(i)
+        return self.get_line_indent(start)
 
     def get_line(self, index):
         return self.lines[index]
@@ -58,6 +208,52 @@ class IndentScanner:
         line = self.get_line(index)
         return len(line) - len(line.lstrip(' '))
 
+
+def scan_line(line, state=EMPTY_STATE):
+    """
+    returns the lexer state at the end of the line given the state at the
+    start of it.
+
+    The state is a tuple of (quote, brackets). quote is the quote of the open
+    triple quoted string, or None if no string is open. brackets is a tuple of
+    (bracket, column) for every open bracket, innermost last. column is where
+    continuation lines inside the bracket should start: lined up with the
+    text after the bracket, or a hanging indent of 4 past the line the bracket
+    was opened on if nothing follows it.
+    """
+    quote, brackets = state
+    i = 0
+    while True:
+        if quote is not None:
+            # inside a triple quoted string. Look for the closing quote
+            m = string_endre[quote].match(line, i)
+            if not m:
+                break
+            quote = None
+            i = m.end()
+        m = tokenre.search(line, i)
+        if not m:
+            break
+        kind = m.lastgroup
+        i = m.end()
+        if kind == "TRIPLE":
+            quote = m.group(kind)
+        elif kind == "COMMENT":
+            # the rest of the line is a comment
+            break
+        elif kind == "OPEN":
+            rest = line[i:]
+            text = rest.lstrip(' ')
+            if len(text) == 0 or text.startswith('#'):
+                column = len(line) - len(line.lstrip(' ')) + 4
+            else:
+                column = i + len(rest) - len(text)
+            brackets += ((m.group(kind), column),)
+        elif kind == "CLOSE":
+            brackets = brackets[:-1]
+    return quote, brackets
+
+
 def match_comment(line):
     """returns True if line is a comment"""
     line = line.lstrip(' ')
@@ -66,28 +262,7 @@ def match_comment(line):
 def match_opener(line):
     """return True if opening an indent block"""
     line = line.strip(' ')
-    synchre = re.compile(r"""
-        ^
-        [ \t]*
-        (?: while
-        |   if
-        |   else
-        |   def
-        |   return
-        |   assert
-        |   break
-        |   class
-        |   continue
-        |   elif
-        |   try
-        |   except
-        |   raise
-        |   import
-        |   yield
-        )
-        \b
-    """, re.VERBOSE | re.MULTILINE).search
-    is_opener = bool(synchre(line))
+    is_opener = bool(openerre.search(line))
     return is_opener and line.endswith(':')
 
 def match_junk(line):
@@ -98,105 +273,13 @@ def match_junk(line):
 def match_closer(line):
     """returns True if closing an indent block"""
     line = line.lstrip(' ')
-    closere = re.compile(r"""
-        \s*
-        (?: return
-        |   break
-        |   continue
-        |   raise
-        |   pass
-        )
-        \b
-    """, re.VERBOSE).match
-    return bool(closere(line))
+    return bool(closerre.match(line))
 
 
 def match_open_string(text):
     """returns True if a multiline string is opened and NOT closed"""
-    quotes = ["'", '"']
-    for quote in quotes:
-        state = "ENTER"
-        for char in text:
-            if state == "ENTER":
-                if char == quote:
-                    state = "FIRST_OPEN_QUOTE"
-                    continue
-                elif char == '\\':
-                    state = "OPENING_ESCAPED_CHAR"
-                    continue
-                elif char == '#':
-                    state = "COMMENT"
-                    continue
-                else:
-                    state = "ENTER"
-                    continue
-            elif state == "COMMENT":
-                if char == '\n':
-                    state = "ENTER"
-                    continue
-                else:
-                    state = "COMMENT"
-                    continue
-            elif state == "FIRST_OPEN_QUOTE":
-                if char == quote:
-                    state = "SECOND_OPEN_QUOTE"
-                    continue
-                elif char == '\\':
-                    state = "OPENING_ESCAPED_CHAR"
-                    continue
-                else:
-                    state = "ENTER"
-                    continue
-            elif state == "SECOND_OPEN_QUOTE":
-                if char == quote:
-                    state = "INNER_QUOTE"
-                    continue
-                if char == '\\':
-                    state = "OPENING_ESCAPED_CHAR"
-                    continue
-                if char == '#':
-                    state = "COMMENT"
-                    continue
-                else:
-                    state = "ENTER"
-                    continue
-            elif state == "OPENING_ESCAPED_CHAR":
-                state = "ENTER"
-                continue
-            elif state == "INNER_QUOTE":
-                if char == quote:
-                    state = "FIRST_ENDING_QUOTE"
-                    continue
-                elif char == '\\':
-                    state = "INNER_QUOTE_ESCAPED_CHAR"
-                    continue
-                else:
-                    state = "INNER_QUOTE"
-                    continue
-            elif state == "INNER_QUOTE_ESCAPED_CHAR":
-                state = "INNER_QUOTE"
-                continue
-            elif state == "FIRST_ENDING_QUOTE":
-                if char == quote:
-                    state = "SECOND_ENDING_QUOTE"
-                    continue
-                elif char == '\\':
-                    state = "INNER_QUOTE_ESCAPED_CHAR"
-                    continue
-                else:
-                    state = "INNER_QUOTE"
-                    continue
-            elif state == "SECOND_ENDING_QUOTE":
-                if char == quote:
-                    state = "ENTER"
-                    continue
-                if char == '\\':
-                    state = "INNER_QUOTE_ESCAPED_CHAR"
-                    continue
-                else:
-                    state = "INNER_QUOTE"
-                    continue
-        if state in ("INNER_QUOTE", "FIRST_ENDING_QUOTE", "SECOND_ENDING_QUOTE", "INNER_QUOTE_ESCAPED_CHAR"):
-            return True
-    return False
-            
+    # Both quote styles are found in the same pass over the text
+    m = None
+    for m in stringre.finditer(text):
+        pass
+    return m is not None and m.lastgroup == "OPEN"
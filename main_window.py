@@ -7,36 +7,64 @@ import tkinter.filedialog
 import colors
 import code_editor as editor
 import styles
-import re
 import inspect
-
-gui_objects = []  # all gui objs in the designer
+import itertools
+import widget_registry
+import spatial_index
+import group_drag as dragging
+import guicore
+import widget_types
+
+gui_objects = widget_registry.WidgetRegistry()  # all gui objs in the designer
+# the rectangles of the movable widgets on the root window's canvas
+widget_index = spatial_index.GridIndex()
+widget_stacking = {}  # k -> guiobj, v -> order it was added in. Later is on top
+stacking_order = itertools.count()  # never repeats, so deleting never causes ties
 selected_objects = ()  # The currently selected gui obj
 # property_entries is a dict of available property entries
 # {k:name v:(containing panel, entry/associated var)}
 property_entries = {}
+shown_properties = []  # names of the properties shown in the panel, in order
+applying_properties = False  # True while apply_properties sets the entries
+dirty_properties = set()  # names of the properties edited since the last save
 root = None  # The tk root window
 main_canvas = None  # The main canvas to put new gui objs on
 current_filename = None
 
-updating_drag = False  # used for dragging multiple widgets
-
-# Methods to ignore when loading src code
-ignore_methods = ["def initialize():",
-                  "def set_text(widget, newtext):",
-                  "def get_text(widget):",
-                  "def append_text(widget, newtext):",
-                  "def popup(msg):",
-                  "def ask_for_string(prompt):",
-                  "def ask_for_yes_no(prompt):",
-                  "def get_selected(somelistbox):"]
-helper_code = open("helpermethods.py", mode="r").read()
+group_drag = None  # moves the selected widgets together when one is dragged
+
+# The classes used to show each kind of widget in the designer.
+# "widgets" uses a real tk widget for every widget. "items" draws the widgets
+# as canvas items and only uses a real tk widget for the selected widgets,
+# which is much lighter for large windows
+render_modes = {"widgets": {"Button": GUIObj.TtkButtonImpl,
+                            "Label": GUIObj.TtkLabelImpl,
+                            "Checkbutton": GUIObj.TtkCheckbuttonImpl,
+                            "Entry": GUIObj.TtkEntryImpl,
+                            "Text": GUIObj.TkTextImpl,
+                            "Canvas": GUIObj.TkCanvasImpl},
+                "items": {"Button": GUIObj.ItemButtonImpl,
+                          "Label": GUIObj.ItemLabelImpl,
+                          "Checkbutton": GUIObj.ItemCheckbuttonImpl,
+                          "Entry": GUIObj.ItemEntryImpl,
+                          "Text": GUIObj.ItemTextImpl,
+                          "Canvas": GUIObj.ItemCanvasImpl}}
+render_mode = "widgets"
+band_start = None  # where the selection band was started, in root window coords
+band_id = None  # the canvas id of the selection band rectangle
+
+# where initialize() and the helper methods are in the loaded file. Saving
+# only replaces initialize() while the user's code is unchanged
+source_layout = None
+loaded_user_code = None  # the code editor's text right after loading
 
 def initialize():
     global root, main_canvas, property_entries, property_frame, designer_title
     global code_title, code_editor, widget_counts, current_filename
+    global group_drag
 
     root = tk.Tk()
+    group_drag = dragging.GroupDrag(root)
     root.configure(background=colors.background)
     root.wm_title("PyPyGUIMaker")
     root.pack_propagate(0)
@@ -70,19 +98,14 @@ def initialize():
     widget_frame.pack(fill=tk.Y)
     widget_frame.pack_propagate(0)
 
-    widgets = (("Button", GUIObj.TtkButtonImpl),
-               ("Label", GUIObj.TtkLabelImpl),
-               ("Checkbutton", GUIObj.TtkCheckbuttonImpl),
-               ("Entry", GUIObj.TtkEntryImpl),
-               ("Text", GUIObj.TkTextImpl),
-               ("Canvas", GUIObj.TkCanvasImpl))
+    widgets = ("Button", "Label", "Checkbutton", "Entry", "Text", "Canvas")
 
     # How many widgets have been created. Useful for naming
     widget_counts = {}
 
     for widget in widgets:
-        widget_counts[widget[0]] = 0
-        create_widget_entry(widget_frame, widget[0], widget[1])
+        widget_counts[widget] = 0
+        create_widget_entry(widget_frame, widget)
 
     main_frame_border = ttk.Frame(root_frame,
                                   style='WhiteSecondaryFrame.TFrame')
@@ -108,6 +131,9 @@ def initialize():
                             highlightthickness=0)
     main_canvas.pack(fill=tk.BOTH, expand=True)
     main_canvas.bind("<Button-1>", unselect_all)
+    main_canvas.bind("<Button-1>", start_band, add="+")
+    main_canvas.bind("<B1-Motion>", drag_band, add="+")
+    main_canvas.bind("<ButtonRelease-1>", finish_band, add="+")
     code_editor = editor.CodeEditor(main_frame)
 
     right_frame_border = ttk.Frame(root_frame,
@@ -166,9 +192,19 @@ def initialize():
     editmenu = tk.Menu(root, tearoff=0)
     editmenu.add_command(label="Clear Widgets", command=clear_all_widgets)
 
+    render_mode_var = tk.StringVar(root, value=render_mode)
+    viewmenu = tk.Menu(root, tearoff=0)
+    viewmenu.add_radiobutton(label="Real Widgets", value="widgets",
+                             variable=render_mode_var,
+                             command=lambda: set_render_mode("widgets"))
+    viewmenu.add_radiobutton(label="Lightweight Previews", value="items",
+                             variable=render_mode_var,
+                             command=lambda: set_render_mode("items"))
+
     menubar = tk.Menu(root)
     menubar.add_cascade(label="File", menu=filemenu)
     menubar.add_cascade(label="Edit", menu=editmenu)
+    menubar.add_cascade(label="View", menu=viewmenu)
     root.config(menu=menubar)
 
     load("blank_file.py")
@@ -193,15 +229,17 @@ def new_file():
 
 def clear_all_widgets():
     """Removes all widgets from the designer"""
-    global gui_objects, selected_objects, current_filename
-    class placeholder():
-        def __init__(self, object_name):
-            self.object_name = object_name
-    obj = placeholder("root")
+    global selected_objects, current_filename
+    group_drag.cancel()
     main_canvas.delete("all")
-    gui_objects = []
+    gui_objects.clear()
+    widget_index.clear()
+    widget_stacking.clear()
     selected_objects = ()
-    load_root(obj, [], [])
+    properties = guicore.load_root(None, [], {})
+    properties["name"] = "root"
+    create_guiobj(widget_types.registry.get_by_source_name("Tk"), None,
+                  properties)
 
 
 def on_delete_press():
@@ -223,7 +261,10 @@ def delete_selected():
 def delete(guiobj):
     global selected_object
     """removes a guiobj from the program"""
+    group_drag.cancel()
     gui_objects.remove(guiobj)
+    widget_index.remove(guiobj)
+    widget_stacking.pop(guiobj, None)
     guiobj.delete()
     if guiobj in selected_objects:
         selected_objects.remove(guiobj)
@@ -244,7 +285,7 @@ def show_designer(event=None):
     code_title.configure(style='WhiteDisabledNavLabel.TLabel')
 
 
-def create_widget_entry(frame, name, widget_type):
+def create_widget_entry(frame, name):
     """
     creates an 'entry' in the given panel for the given widget. This entry
     allows the user to drag an drop a widget onto a canvas
@@ -263,7 +304,7 @@ def create_widget_entry(frame, name, widget_type):
     widget_label.bind('<Button-1>', click_new_widget)
     widget_label.bind('<B1-Motion>', drag_new_widget)
     widget_label.bind('<ButtonRelease-1>',
-                      lambda event: drop_new_widget(event, name, widget_type))
+                      lambda event: drop_new_widget(event, name))
 
 
 def enter_widget_entry(frame, label):
@@ -337,7 +378,7 @@ def drag_new_widget(event):
     new_widget_canvas.place(x=rootx, y=rooty)
 
 
-def drop_new_widget(event, widget_name, widget_type):
+def drop_new_widget(event, widget_name):
     """
     called when the user stops dragging a new widget
     actually creates a new widget
@@ -354,11 +395,10 @@ def drop_new_widget(event, widget_name, widget_type):
         x = rootx - canvasx
         y = rooty - canvasy
         position = GUIObj.Vector(x, y)
+        widget_type = get_widget_type(widget_name)
         new_widget = widget_type(parent=root_widget, name=name,
                                  canvas=root_widget.widget, position=position)
-        new_widget.bind_event("selected", on_selection)
-        new_widget.bind_event("moved", on_move)
-        gui_objects.append(new_widget)
+        add_guiobj(new_widget)
 
 
 def create_property_option(panel, options):
@@ -379,11 +419,14 @@ def create_property_option(panel, options):
         # it's easier to use a frame as a border than to style ttk entries
         border = tk.Frame(frame, background=colors.white_primary)
         border.pack(side=tk.RIGHT, padx=5)
+        text_var = tk.StringVar()
         text = tk.Entry(border, width=20, borderwidth=2, insertwidth=1,
                         relief="flat",
                         foreground="black",
-                        disabledbackground=colors.white_disabled)
+                        disabledbackground=colors.white_disabled,
+                        textvariable=text_var)
         text.pack(side=tk.RIGHT, padx=2, pady=2)
+        text_var.trace("w", lambda *args: mark_property_dirty(name))
 
         text.bind("<FocusIn>",
                   lambda event: set_background(border,
@@ -404,7 +447,9 @@ def create_property_option(panel, options):
 
         option.bind("<FocusOut>",
                     lambda event: save_selectedobj_properties(), add="+")
-        value.trace("w", lambda *args: save_selectedobj_properties())
+        # one trace, as tcl runs the traces of a variable newest first and
+        # the option must be marked dirty before it is saved
+        value.trace("w", lambda *args: save_property_option(name))
 
         return (frame, value)
 
@@ -413,8 +458,20 @@ def hide_all_properties():
     """
     hides all properties
     """
+    global shown_properties
     for name in property_entries.keys():
         hide_property(name)
+    shown_properties = []
+
+
+def get_edited_value(name):
+    """
+    returns the value of the property entry if the user edited it since the
+    last save. returns None if it was not edited or is a mixed value
+    """
+    if name not in dirty_properties:
+        return None
+    return get_property_value(name)
 
 
 def get_property_value(name):
@@ -438,6 +495,8 @@ def set_property_value(name, value):
         property_entries[name][1].insert(0, value)
     else:  # otherwise we are setting the property of an associated variable
         property_entries[name][1].set(value)
+    # the entry shows the value of the objects again
+    dirty_properties.discard(name)
 
 
 def show_property(name):
@@ -454,133 +513,142 @@ def hide_property(name):
     property_entries[name][0].pack_forget()
 
 
-def load_property(name, value, multi):
+def apply_properties(properties):
     """
-    shows and sets the property value
+    makes the properties panel show the given {name: value} properties
+
+    only entries whose value is different are set, and the entries are only
+    repacked when a different set of properties is shown
     """
-    show_property(name)
-    if multi:
-        multi_properties[name] = multi_properties.get(name, 0) + 1
-        old_value = get_property_value(name)
-        if old_value != str(value):
-            set_property_value(name, "\032")
-        else:
-            set_property_value(name, value)
-    else:
-        set_property_value(name, value)
+    global shown_properties, applying_properties
+    # setting an option fires its trace, which would save the half updated
+    # panel into the selected objects
+    applying_properties = True
+    try:
+        if list(properties) != shown_properties:
+            for name in shown_properties:
+                hide_property(name)
+            for name in properties:
+                show_property(name)
+            shown_properties = list(properties)
+        for name, value in properties.items():
+            if property_entries[name][1].get() != value:
+                set_property_value(name, value)
+    finally:
+        applying_properties = False
 
 
-def start_load_properties_multi():
-    global multi_properties
-    # a dict of properties and how many times its been loaded
-    multi_properties = {}
+def load_selectedobj_properties():
+    pass
 
 
-def finish_load_properties_multi(total_loaded):
-    global multi_properties
-    for name in multi_properties.keys():
-        if multi_properties[name] < total_loaded:
-            hide_property(name)
-    multi_properties = {}
+def mark_property_dirty(name):
+    """called when a property entry changes. Marks it to be saved"""
+    dirty_properties.add(name)
 
 
-def load_selectedobj_properties():
-    pass
+def save_property_option(name):
+    """called when an option is chosen. Saves it to the selected objects at once"""
+    mark_property_dirty(name)
+    save_selectedobj_properties()
 
 
 def save_selectedobj_properties():
-    global updating_drag
-    updating_drag = True
+    """saves the edited properties to every selected object"""
+    if applying_properties or not dirty_properties:
+        return
     for obj in selected_objects:
         save_properties(obj)
-    updating_drag = False
-
-
-def load_properties(guiobj, multi):
-    if not multi:
-        hide_all_properties()
-        # The ordering of these calls determines the position of the properties
-    load_guiobj_properties(guiobj, multi)
-    load_widget_properties(guiobj, multi)
-    load_movable_properties(guiobj, multi)
-    load_sizable_properties(guiobj, multi)
-    load_textcontainer_properties(guiobj, multi)
-    load_entry_properties(guiobj, multi)
-    load_button_properties(guiobj, multi)
-    load_checkbutton_properties(guiobj, multi)
-    load_text_properties(guiobj, multi)
-    load_canvas_properties(guiobj, multi)
-    load_window_properties(guiobj, multi)
+    dirty_properties.clear()
 
+
+def load_properties(guiobjs):
+    """shows the properties of the given guiobjs in the properties panel"""
+    apply_properties(merge_properties(guiobjs))
     root.focus()  # reset text focus. Removes any highlighting
 
 
+def get_properties(guiobj):
+    """
+    returns a dict of the properties of the guiobj that the panel shows,
+    in the order they are shown
+    """
+    properties = {}
+    for load in widget_types.registry.property_loaders(guiobj):
+        load(guiobj, properties)
+    return properties
+
+
+def merge_properties(guiobjs):
+    """
+    returns the properties shared by all of the guiobjs as strings
+
+    properties that only some of the guiobjs have are left out, and
+    properties whose values differ are "\032", which the panel shows as a
+    mixed value. Names are unique, so Name is left out for several guiobjs
+    """
+    merged = None
+    for guiobj in guiobjs:
+        properties = get_properties(guiobj)
+        if merged is None:
+            merged = {name: str(value) for name, value in properties.items()}
+            continue
+        for name in list(merged):
+            if name not in properties:
+                del merged[name]
+            elif merged[name] != str(properties[name]):
+                merged[name] = "\032"
+    if merged is None:
+        return {}
+    if len(guiobjs) > 1:
+        merged.pop("Name", None)
+    return merged
+
+
 def save_properties(guiobj):
     """
-    saves all the properties set in the options panel to the selected widget
-    """
-    if isinstance(guiobj, GUIObj.Window):
-        save_window_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Checkbutton):
-        save_checkbutton_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Text):
-        save_text_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Entry):
-        save_entry_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Button):
-        save_button_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Canvas):
-        save_canvas_properties(guiobj)
-    if isinstance(guiobj, GUIObj.MovableWidget):
-        save_movable_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Sized):
-        save_sizable_properties(guiobj)
-    if isinstance(guiobj, GUIObj.TextContainer):
-        save_textcontainer_properties(guiobj)
-    if isinstance(guiobj, GUIObj.Widget):
-        save_widget_properties(guiobj)
-    if isinstance(guiobj, GUIObj.GUIObj):
-        save_guiobj_properties(guiobj)
+    saves the properties edited in the options panel to the selected widget
+    """
+    for save in widget_types.registry.property_savers(guiobj):
+        save(guiobj)
 
 
 def save_window_properties(guiobj):
-    title = get_property_value("Text")
+    title = get_edited_value("Text")
 
-    if title is not None:
+    if title is not None and guiobj.title != title:
         guiobj.title = title
 
 
-def load_window_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Window):
-        load_property("Text", guiobj.title, multi)
+def load_window_properties(guiobj, properties):
+    properties["Text"] = guiobj.title
 
 
 def save_checkbutton_properties(guiobj):
-    command = get_property_value("Command")
-    offvalue = get_property_value("Off Value")
-    onvalue = get_property_value("On Value")
-    takefocus = get_property_value("Take Focus")
-    variable = get_property_value("Variable")
+    command = get_edited_value("Command")
+    offvalue = get_edited_value("Off Value")
+    onvalue = get_edited_value("On Value")
+    takefocus = get_edited_value("Take Focus")
+    variable = get_edited_value("Variable")
 
-    if command is not None:
+    if command is not None and guiobj.command != command:
         guiobj.command = command
-    if offvalue is not None:
+    if offvalue is not None and guiobj.offvalue != offvalue:
         guiobj.offvalue = offvalue
-    if onvalue is not None:
+    if onvalue is not None and guiobj.onvalue != onvalue:
         guiobj.onvalue = onvalue
-    if takefocus is not None:
+    if takefocus is not None and guiobj.takefocus != takefocus:
         guiobj.takefocus = takefocus
-    if variable is not None:
+    if variable is not None and guiobj.variable != variable:
         guiobj.variable = variable
 
 
-def load_checkbutton_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Checkbutton):
-        load_property("Command", guiobj.command, multi)
-        load_property("Off Value", guiobj.offvalue, multi)
-        load_property("On Value", guiobj.onvalue, multi)
-        load_property("Take Focus", guiobj.takefocus, multi)
-        load_property("Variable", guiobj.variable, multi)
+def load_checkbutton_properties(guiobj, properties):
+    properties["Command"] = guiobj.command
+    properties["Off Value"] = guiobj.offvalue
+    properties["On Value"] = guiobj.onvalue
+    properties["Take Focus"] = guiobj.takefocus
+    properties["Variable"] = guiobj.variable
 
 
 def save_text_properties(guiobj):
@@ -588,121 +656,111 @@ def save_text_properties(guiobj):
     pass
 
 
-def load_text_properties(guiobj, multi):
+def load_text_properties(guiobj, properties):
     #  Text doesn't add anything new so we can just pass
     pass
 
 
 def save_canvas_properties(guiobj):
-    bg = get_property_value("Background Color")
-    if bg is not None:
+    bg = get_edited_value("Background Color")
+    if bg is not None and guiobj.bg != bg:
         guiobj.bg = bg
 
 
-def load_canvas_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Canvas):
-        load_property("Background Color", guiobj.bg, multi)
+def load_canvas_properties(guiobj, properties):
+    properties["Background Color"] = guiobj.bg
 
 
 def save_entry_properties(guiobj):
-    justify = get_property_value("Justify")
-    show = get_property_value("Show")
-    associated_variable = get_property_value("Associated Variable")
-    validate = get_property_value("Validate")
-    validate_command = get_property_value("Validate Command")
+    justify = get_edited_value("Justify")
+    show = get_edited_value("Show")
+    associated_variable = get_edited_value("Associated Variable")
+    validate = get_edited_value("Validate")
+    validate_command = get_edited_value("Validate Command")
 
-    if justify is not None:
+    if justify is not None and guiobj.justify != justify:
         guiobj.justify = justify
-    if show is not None:
+    if show is not None and guiobj.show != show:
         guiobj.show = show
-    if associated_variable is not None:
+    if (associated_variable is not None and
+            guiobj.associated_variable != associated_variable):
         guiobj.associated_variable = associated_variable
-    if validate is not None:
+    if validate is not None and guiobj.validate != validate:
         guiobj.validate = validate
-    if validate_command is not None:
+    if (validate_command is not None and
+            guiobj.validate_command != validate_command):
         guiobj.validate_command = validate_command
 
 
-def load_entry_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Entry):
-        load_property("Justify", guiobj.justify, multi)
-        load_property("Show", guiobj.show, multi)
-        load_property("Associated Variable", guiobj.associated_variable, multi)
-        load_property("Validate", guiobj.validate, multi)
-        load_property("Validate Command", guiobj.validate, multi)
+def load_entry_properties(guiobj, properties):
+    properties["Justify"] = guiobj.justify
+    properties["Show"] = guiobj.show
+    properties["Associated Variable"] = guiobj.associated_variable
+    properties["Validate"] = guiobj.validate
+    properties["Validate Command"] = guiobj.validate_command
 
 
 def save_button_properties(guiobj):
-    command = get_property_value("Command")
+    command = get_edited_value("Command")
 
-    if command is not None:
+    if command is not None and guiobj.command != command:
         guiobj.command = command
 
 
-def load_button_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Button):
-        load_property("Command", guiobj.command, multi)
+def load_button_properties(guiobj, properties):
+    properties["Command"] = guiobj.command
 
 
 def save_movable_properties(guiobj):
     x = guiobj.position.x
     y = guiobj.position.y
     try:
-        x = int(get_property_value("X Position"))
+        x = int(get_edited_value("X Position"))
     except:
         x = guiobj.position.x
     try:
-        y = int(get_property_value("Y Position"))
+        y = int(get_edited_value("Y Position"))
     except:
         y = guiobj.position.y
-    guiobj.position = GUIObj.Vector(x, y)
+    if x != guiobj.position.x or y != guiobj.position.y:
+        guiobj.position = GUIObj.Vector(x, y)
 
 
-def load_movable_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.MovableWidget):
-        if not multi and len(selected_objects) > 1:
-            load_property("X Position", guiobj.position.x, True)
-            load_property("Y Position", guiobj.position.y, True)
-        else:
-            load_property("X Position", guiobj.position.x, multi)
-            load_property("Y Position", guiobj.position.y, multi)
+def load_movable_properties(guiobj, properties):
+    properties["X Position"] = guiobj.position.x
+    properties["Y Position"] = guiobj.position.y
 
 
 def save_sizable_properties(guiobj):
     x = guiobj.size.x
     y = guiobj.size.y
     try:
-        x = int(get_property_value("Width"))
+        x = int(get_edited_value("Width"))
     except:
         x = guiobj.size.x
     try:
-        y = int(get_property_value("Height"))
+        y = int(get_edited_value("Height"))
     except:
         y = guiobj.size.y
-    guiobj.size = GUIObj.Vector(x, y)
+    if x != guiobj.size.x or y != guiobj.size.y:
+        guiobj.size = GUIObj.Vector(x, y)
 
 
-def load_sizable_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.Sized):
-        if not multi and len(selected_objects) > 1:
-            load_property("Width", guiobj.size.x, True)
-            load_property("Height", guiobj.size.y, True)
-        else:
-            load_property("Width", guiobj.size.x, multi)
-            load_property("Height", guiobj.size.y, multi)
+def load_sizable_properties(guiobj, properties):
+    properties["Width"] = guiobj.size.x
+    properties["Height"] = guiobj.size.y
 
 
 def save_textcontainer_properties(guiobj):
-    text = get_property_value("Text")
+    text = get_edited_value("Text")
 
-    if text is not None:
+    if text is not None and guiobj.text != text:
         guiobj.text = text
     # TODO: save font
 
 
-def load_textcontainer_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.TextContainer):
-        load_property("Text", guiobj.text, multi)
+def load_textcontainer_properties(guiobj, properties):
+    properties["Text"] = guiobj.text
 
 
 def save_widget_properties(guiobj):
@@ -710,24 +768,21 @@ def save_widget_properties(guiobj):
     pass
 
 
-def load_widget_properties(guiobj, multi):
+def load_widget_properties(guiobj, properties):
     pass
 
 
 def save_guiobj_properties(guiobj):
-    name = get_property_value("Name")
-    if name is not None:
-        guiobj.name = get_property_value("Name")
+    name = get_edited_value("Name")
+    if name is not None and name != guiobj.name:
+        if not gui_objects.rename(guiobj, name) and len(selected_objects) == 1:
+            # the name is taken. Show the name that was kept
+            set_property_value("Name", guiobj.name)
 
 
-def load_guiobj_properties(guiobj, multi):
-    if isinstance(guiobj, GUIObj.GUIObj):
-        if not multi:
-            if not isinstance(guiobj, GUIObj.WindowImpl):
-                load_property("Name", guiobj.name, multi)
-        if multi:
-            load_property("Name", "\032", multi)
-            hide_property("Name")
+def load_guiobj_properties(guiobj, properties):
+    if not isinstance(guiobj, GUIObj.WindowImpl):
+        properties["Name"] = guiobj.name
 
 
 def set_background(widget, color):
@@ -745,28 +800,181 @@ def get_guiobj(name):
     returns the guiobj of the given name.
     return None if nothing is found
     """
-    # Simple sequential search
-    for obj in gui_objects:
-        if obj.name == name:
-            return obj
-    return None
+    return gui_objects.get(name)
+
+
+def get_widget_type(widget_name):
+    """returns the class used to show the named kind of widget"""
+    return render_modes[render_mode][widget_name]
+
+
+def set_render_mode(mode):
+    """
+    changes how widgets are shown in the designer
+    reloads the current widgets with the classes of the new mode
+    """
+    global render_mode
+    if mode == render_mode:
+        return
+    src = gui_to_src()
+    try:
+        guiparser.get_tree(src)
+    except SyntaxError as e:
+        print("error when changing the render mode")
+        print(e)
+        return
+    render_mode = mode
+    clear()
+    load_initialize(src)
+
+
+def add_guiobj(guiobj):
+    """
+    adds a guiobj to the designer
+
+    binds the designer callbacks and keeps the widget index up to date as the
+    guiobj is moved or resized
+    """
+    guiobj.bind_event("selected", on_selection)
+    if isinstance(guiobj, GUIObj.MovableWidget):
+        guiobj.bind_event("dragged", on_drag)
+        guiobj.bind_event("moved", update_widget_index)
+        guiobj.bind_event("resized", update_widget_index)
+        guiobj.bind_event("moved", on_selected_moved)
+        guiobj.bind_event("resized", on_selected_resized)
+        widget_stacking[guiobj] = next(stacking_order)
+        update_widget_index(GUIObj.Event(guiobj))
+    gui_objects.add(guiobj)
 
 
-def on_move(guievent):
+def update_widget_index(guievent):
+    """callback for when a widget is moved or resized. Updates its rectangle"""
+    guiobj = guievent.caller
+    x, y = guiobj.position.x, guiobj.position.y
+    size = guiobj.size if isinstance(guiobj, GUIObj.Sized) else GUIObj.Vector(0, 0)
+    widget_index.insert(guiobj, x, y, x + size.x, y + size.y)
+
+
+def get_guiobj_at(x, y):
+    """
+    returns the top guiobj under the point on the root window's canvas.
+    return None if nothing is there
+    """
+    found = widget_index.query_point(x, y)
+    if not found:
+        return None
+    return max(found, key=widget_stacking.get)
+
+
+def get_guiobjs_in(x0, y0, x1, y1):
+    """returns the guiobjs that overlap the rectangle on the root window's canvas"""
+    found = widget_index.query_rect(x0, y0, x1, y1)
+    return sorted(found, key=widget_stacking.get)
+
+
+def get_band_position(event):
+    """returns the position of the mouse on the root window's canvas"""
+    canvas = get_guiobj("root").widget
+    return (canvas.canvasx(event.x_root - canvas.winfo_rootx()),
+            canvas.canvasy(event.y_root - canvas.winfo_rooty()))
+
+
+def start_band(event):
+    """
+    called when the user presses on an empty part of the designer
+    starts a selection band
+    """
+    global band_start, band_id
+    band_start = None
+    band_id = None
+    position = get_band_position(event)
+    if get_guiobj_at(*position) is not None:
+        # the press was on a widget drawn as canvas items
+        return
+    band_start = position
+
+
+def drag_band(event):
+    """called when the user drags a selection band. Redraws the band"""
+    global band_id
+    if band_start is None:
+        return
+    canvas = get_guiobj("root").widget
+    x0, y0 = band_start
+    x1, y1 = get_band_position(event)
+    if band_id is None:
+        band_id = canvas.create_rectangle(x0, y0, x1, y1, dash=(4, 2),
+                                          outline=colors.darkblue_primary)
+    else:
+        canvas.coords(band_id, x0, y0, x1, y1)
+
+
+def finish_band(event):
+    """
+    called when the user lets go of a selection band
+    selects every widget the band touches
+    """
+    global band_start, band_id, selected_objects
+    if band_start is None:
+        return
+    x0, y0 = band_start
+    x1, y1 = get_band_position(event)
+    band_start = None
+    if band_id is None:
+        # the mouse did not move, so this was just a click
+        return
+    get_guiobj("root").widget.delete(band_id)
+    band_id = None
+    if abs(x1 - x0) < 3 and abs(y1 - y0) < 3:
+        return
+    unselect_all()
+    # the widgets are selected without their selected events, which would
+    # reload the properties panel once per widget
+    selected_objects = get_guiobjs_in(x0, y0, x1, y1)
+    for obj in selected_objects:
+        obj.multiselect(notify=False)
+    group_drag.cancel()
+    if selected_objects:
+        load_properties(selected_objects)
+
+
+def on_drag(guievent):
     """
     callback for when a widget is dragged
 
-    moves all other selected widgets
+    moves all selected widgets along with it on the next frame
+    """
+    group = [obj for obj in selected_objects
+             if isinstance(obj, GUIObj.MovableWidget)]
+    group_drag.drag(guievent.caller, guievent.position, group)
+
+
+def on_selected_moved(guievent):
+    """
+    callback for when a widget is moved
+
+    shows the new position if the widget is selected. Selected widgets are
+    moved together, so the panel only follows the first one
+    """
+    if selected_objects and guievent.caller is selected_objects[0]:
+        for name, value in (("X Position", guievent.caller.position.x),
+                            ("Y Position", guievent.caller.position.y)):
+            # mixed values stay mixed
+            if get_property_value(name) is not None:
+                set_property_value(name, value)
+
+
+def on_selected_resized(guievent):
     """
-    global updating_drag
-    if not updating_drag:
-        updating_drag = True
-        for obj in selected_objects:
-            if obj is not guievent.caller:
-                position = obj.position
-                position += guievent.delta
-                obj.position = position
-        updating_drag = False
+    callback for when a widget is resized
+
+    shows the new size if the widget is the first selected widget
+    """
+    if selected_objects and guievent.caller is selected_objects[0]:
+        for name, value in (("Width", guievent.caller.size.x),
+                            ("Height", guievent.caller.size.y)):
+            if get_property_value(name) is not None:
+                set_property_value(name, value)
 
 
 def on_selection(guievent):
@@ -778,8 +986,9 @@ def on_selection(guievent):
     the current widget
     """
     root.focus()  # will remove all entry focus
-    for obj in selected_objects:
-        save_properties(obj)
+    # the selection may change, so the next drag tags the widgets again
+    group_drag.cancel()
+    save_selectedobj_properties()
     if get_guiobj("root") in selected_objects:
         selected_objects.remove(get_guiobj("root"))
     caller = guievent.caller
@@ -787,21 +996,9 @@ def on_selection(guievent):
         if guievent.multiselect is False:
             unselect_others(caller)
             selected_objects = [caller]
-            load_properties(caller, False)
         else:
             selected_objects.append(caller)
-            start_load_properties_multi()
-            for obj in selected_objects:
-                load_properties(obj, True)
-            finish_load_properties_multi(len(selected_objects))
-        if isinstance(caller, GUIObj.MovableWidget):
-            caller.bind_event("moved",
-                              lambda event: load_movable_properties(caller,
-                                                                    False))
-        if isinstance(caller, GUIObj.SizableWidget):
-            caller.bind_event("resized",
-                              lambda event: load_sizable_properties(caller,
-                                                                    False))
+        load_properties(selected_objects)
 
 
 def unselect_others(exluded):
@@ -810,11 +1007,10 @@ def unselect_others(exluded):
     """
     global selected_objects
 
+    save_selectedobj_properties()
     for obj in gui_objects:
         if obj is not exluded:
             obj.selected = False
-            if obj in selected_objects:
-                save_properties(obj)
     selected_objects = [exluded]
 
 
@@ -826,18 +1022,19 @@ def unselect_all(event=None):
 
     for obj in gui_objects:
         obj.selected = False
-    for obj in selected_objects:
-        save_properties(obj)
+    save_selectedobj_properties()
     selected_objects = []
 
 
 def clear():
-    global gui_objects
     """
     resets the window to its initial state
     """
     unselect_all()
-    gui_objects = []
+    group_drag.cancel()
+    gui_objects.clear()
+    widget_index.clear()
+    widget_stacking.clear()
     main_canvas.delete("all")
 
 
@@ -860,401 +1057,53 @@ def load(filename):
     """
     loads the file with the given filename
     """
-    global current_filename
+    global current_filename, source_layout
     clear()
     file = open(filename, "r")
     source = file.read()
     file.close()
-    load_code(source)
+    # the tree is cached, so load_initialize does not parse the source again
+    source_layout = guicore.get_source_layout(source)
+    load_code(source_layout)
     load_initialize(source)
     current_filename = file.name
     root.wm_title("PyPyGUIMaker: %s" % (current_filename))
 
 
-def load_code(source):
-    """
-    load the src code into GUIObjs and into the code editor
-    """
-    src = []  # lines of source code
-    # This state machine loads every line into src besides "initialize()" and
-    # everything inside "def initialize()"
-    state = "NORMAL"
-    indent_level = 0
-    for line in source.splitlines():
-        if state == "NORMAL":
-            if line.strip(' ') in ignore_methods:
-                state = "IGNORE_START"
-                continue
-            if line == "initialize()":
-                continue
-            else:
-                src.append(line)
-        elif state == "IGNORE_START":
-            state = "IGNORE"
-            indent_level = len(line) - len(line.lstrip(' '))
-            continue
-        elif state == "IGNORE":
-            if line.lstrip(' ').startswith('#'):
-                continue
-            elif len(line.lstrip(' ')) == 0:
-                continue
-            elif len(line) - len(line.lstrip(' ')) < indent_level:
-                state = "NORMAL"
-                if line.strip(' ') in ignore_methods:
-                    state = "IGNORE_START"
-                elif line != "initialize()":
-                    src.append(line)
-                continue
-            else:
-                continue
-
-    code_editor["text"] = "\n".join(src).rstrip()
+def load_code(layout):
+    """
+    load the src code into the code editor, leaving out initialize() and the
+    helper methods
+    """
+    global loaded_user_code
+    code_editor["text"] = layout.get_user_code()
     code_editor.updateLineNumbers()
+    loaded_user_code = code_editor["text"]
 
 
 def load_initialize(source):
     """
     loads the guiobjs from the initialization function in the given file
     """
-    tree = guiparser.get_tree(source)
-    initialize_function = guiparser.get_initialize(tree)
-    initialize_objects = guiparser.get_objects(initialize_function)
-    for obj in initialize_objects:
-        # make sense of the returned objects and create them in the canvas
-        assignments = guiparser.get_assignments(initialize_function,
-                                                obj.object_name)
-        method_calls = guiparser.get_method_calls(initialize_function,
-                                                  obj.object_name)
-
-        if obj.object_type == "Tk":
-            load_root(obj, assignments, method_calls)
-        elif obj.object_type == "Button":
-            load_button(obj, assignments, method_calls)
-        elif obj.object_type == "Label":
-            load_label(obj, assignments, method_calls)
-        elif obj.object_type == "Entry":
-            load_entry(obj, assignments, method_calls)
-        elif obj.object_type == "Checkbutton":
-            load_checkbutton(obj, assignments, method_calls)
-        elif obj.object_type == "Text":
-            load_text(obj, assignments, method_calls)
-        elif obj.object_type == "Canvas":
-            load_canvas(obj, assignments, method_calls)
-        else:
-            print()
-            print("Error when loading objects.")
-            print("Objects of type %s are not yet supported" %
-                  (obj.object_type))
-
-
-def load_command(cmd):
-    """
-    Given the value of a command attribute in an assignment on a guiobj, return
-    the appropriate string to represent it
+    guicore.load_gui(source, create_guiobj)
 
-    This will make both lambdas and normal method names load to strings
-    """
-    if not isinstance(cmd, str):
-        return guiparser.get_lambda_value(cmd)
-    else:
-        return cmd
 
-
-def save_command(cmd):
+def create_guiobj(widget_type, parent, properties):
     """
-    Given a str value for a command return the str that must be written in the
-    assignment value.
-
-    Basically adds lambda if we need to
+    creates the designer's guiobj of the widget type and adds it to the
+    designer. properties are the keyword arguments read from the source
     """
-    if re.match(r".*\(.*\).*", cmd):
-        return "lambda: " + cmd
-    else:
-        return cmd
-
-
-def load_root(obj, assignments, method_calls):
-    """
-    loads the root object code into guiobjs
-    """
-    # the Tk type should only be instantiated once and is represented by a
-    # window obj
-    title = ""
-    size = GUIObj.Vector(800, 600)
-    # find the parameters for the window
-    # almost everything for window is in single argument method calls
-    if "title" in method_calls:
-        title = method_calls["title"].args[0]
-    if "geometry" in method_calls:
-        # geometry is given as a string formated as XPOSxYPOS ex: 600x800
-        # split it up and turn it into a vector
-        x = int(method_calls["geometry"].args[0].split("x")[0])
-        y = int(method_calls["geometry"].args[0].split("x")[1])
-        size = GUIObj.Vector(x, y)
-    new_window = GUIObj.WindowImpl(canvas=main_canvas, title=title, size=size,
-                                   name=obj.object_name)
-    new_window.bind_event("selected", on_selection)
-    gui_objects.append(new_window)
-
-
-def load_button(obj, assignments, method_calls):
-    """
-    loads button code into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    command = ""
-    text = ""
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-
-    if "command" in obj.keywords:
-        command = load_command(obj.keywords["command"])
-    if "text" in obj.keywords:
-        text = obj.keywords["text"]
-
-    for assignment in assignments:
-        if isinstance(assignment, guiparser.SubscriptAssignment):
-            if assignment.subscript == "text":
-                text = assignment.value
-            elif assignment.subscript == "command":
-                command = assignment.value
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-
-    if parent is None:
-        print("Error when loading objects. cannot find parent of %s named %s"
-              % (obj.name, parent_name))
-
-    new_button = GUIObj.TtkButtonImpl(name=obj.object_name,
-                                      canvas=parent.widget,
-                                      position=position,
-                                      size=size,
-                                      parent=parent,
-                                      command=command,
-                                      text=text)
-    new_button.bind_event("selected", on_selection)
-    new_button.bind_event("moved", on_move)
-    gui_objects.append(new_button)
-
-
-def load_label(obj, assignments, method_calls):
-    """
-    loads label code into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    text = ""
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-
-    if "text" in obj.keywords:
-        text = obj.keywords["text"]
-
-    for assignment in assignments:
-        if isinstance(assignment, guiparser.SubscriptAssignment):
-            if assignment.subscript == "text":
-                text = assignment.value
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-
-    new_label = GUIObj.TtkLabelImpl(name=obj.object_name, canvas=parent.widget,
-                                    position=position, size=size,
-                                    parent=parent, text=text)
-    new_label.bind_event("selected", on_selection)
-    new_label.bind_event("moved", on_move)
-    gui_objects.append(new_label)
-
-
-def load_text(obj, assignments, method_calls):
-    """
-    loads text code into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-
-    new_text = GUIObj.TkTextImpl(name=obj.object_name, canvas=parent.widget,
-                                 position=position, size=size, parent=parent)
-    new_text.bind_event("selected", on_selection)
-    new_text.bind_event("moved", on_move)
-    gui_objects.append(new_text)
-
-
-def load_entry(obj, assignment, method_calls):
-    """
-    loads entry code into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    text = ""
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-    justify = "left"
-    show = ""
-    associated_variable = ""
-    validate = ""
-    validate_command = ""
-
-    for word in obj.keywords:
-        if word == "text":
-            text = obj.keywords["text"]
-        elif word == "justify":
-            justify = obj.keywords["justify"]
-            if justify == "tk.LEFT":
-                justify = "left"
-            elif justify == "tk.RIGHT":
-                justify = "right"
-            elif justify == "tk.CENTER":
-                justify = "center"
-        elif word == "show":
-            show = obj.keywords["show"]
-        elif word == "textvariable":
-            associated_variable = obj.keywords["textvariable"]
-        elif word == "validate":
-            validate = obj.keywords["validate"]
-        elif word == "validatecommand":
-            validate_command = load_command(obj.keywords["validatecommand"])
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-        if method.method_name == "insert":
-            # assure that we're inserting at the very start
-            if method.args[0] == 0:
-                text = method.args[1]
-            else:
-                print("Cannot insert text at any place other than 0")
-
-    new_entry = GUIObj.TtkEntryImpl(name=obj.object_name,
-                                    canvas=parent.widget,
-                                    position=position,
-                                    size=size,
-                                    parent=parent,
-                                    text=text,
-                                    justify=justify,
-                                    show=show,
-                                    associated_variable=associated_variable,
-                                    validate=validate,
-                                    validatecommand=validate_command)
-    new_entry.bind_event("selected", on_selection)
-    new_entry.bind_event("moved", on_move)
-    gui_objects.append(new_entry)
-
-
-def load_checkbutton(obj, assignments, method_calls):
-    """
-    loads checkbutton into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    text = ""
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-
-    if "text" in obj.keywords:
-        text = obj.keywords["text"]
-
-    for assignment in assignments:
-        if isinstance(assignment, guiparser.SubscriptAssignment):
-            if assignment.subscript == "text":
-                text = assignment.value
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-
-    new_checkbutton = GUIObj.TtkCheckbuttonImpl(name=obj.object_name,
-                                                canvas=parent.widget,
-                                                position=position,
-                                                size=size,
-                                                parent=parent,
-                                                text=text)
-    new_checkbutton.bind_event("selected", on_selection)
-    new_checkbutton.bind_event("moved", on_move)
-    gui_objects.append(new_checkbutton)
-
-
-def load_canvas(obj, assignments, method_calls):
-    """
-    loads canvas into a guiobj
-    """
-    parent_name = obj.args[0]
-    parent = get_guiobj(parent_name)
-    bg = ""
-    position = GUIObj.Vector(0, 0)
-    size = GUIObj.Vector(0, 0)
-
-    if "bg" in obj.keywords:
-        bg = obj.keywords["bg"]
-
-    for method in method_calls.values():
-        if method.method_name == "place":
-            if "x" in method.keywords:
-                position.x = int(method.keywords["x"])
-            if "y" in method.keywords:
-                position.y = int(method.keywords["y"])
-            if "width" in method.keywords:
-                size.x = int(method.keywords["width"])
-            if "height" in method.keywords:
-                size.y = int(method.keywords["height"])
-        if method.method_name in ["config", "configure"]:
-            if "bg" in method.keywords:
-                bg = method.keywords["bg"]
-
-    new_canvas = GUIObj.TkCanvasImpl(name=obj.object_name,
-                                     canvas=parent.widget,
-                                     position=position,
-                                     size=size,
-                                     parent=parent,
-                                     bg=bg)
-    new_canvas.bind_event("selected", on_selection)
-    new_canvas.bind_event("moved", on_move)
-    gui_objects.append(new_canvas)
+    if widget_type.source_name == "Tk":
+        new_window = GUIObj.WindowImpl(canvas=main_canvas, **properties)
+        add_guiobj(new_window)
+        new_window.widget.bind("<Button-1>", start_band, add="+")
+        new_window.widget.bind("<B1-Motion>", drag_band, add="+")
+        new_window.widget.bind("<ButtonRelease-1>", finish_band, add="+")
+        return new_window
+    widget_class = get_widget_type(widget_type.source_name)
+    new_guiobj = widget_class(canvas=parent.widget, parent=parent, **properties)
+    add_guiobj(new_guiobj)
+    return new_guiobj
 
 
 def load_example(filename):
@@ -1288,236 +1137,47 @@ def save_as():
 
 
 def save_gui(filename):
-    src = gui_to_src()
-    with open(filename, 'w') as file:
-        file.write(src)
+    global source_layout
+    layout = None
+    if code_editor["text"] == loaded_user_code:
+        # the user's code was not edited, so the rest of the file is kept as
+        # it was loaded and only initialize() is regenerated
+        layout = source_layout
+    source_layout = guicore.save_gui(filename, gui_objects,
+                                     code_editor["text"], layout)
 
 
 def gui_to_src():
-    src = ""
-    associated_vars = []
-    mainloop = ""
-    # get the widget creation code
-    for obj in gui_objects:
-        if isinstance(obj, GUIObj.TtkLabelImpl):
-            src += label_to_src(obj)
-        elif isinstance(obj, GUIObj.TkTextImpl):
-            src += text_to_src(obj)
-        elif isinstance(obj, GUIObj.TtkButtonImpl):
-            src += button_to_src(obj)
-        elif isinstance(obj, GUIObj.TtkEntryImpl):
-            src += entry_to_src(obj, associated_vars)
-        elif isinstance(obj, GUIObj.TtkCheckbuttonImpl):
-            src += checkbutton_to_src(obj, associated_vars)
-        elif isinstance(obj, GUIObj.WindowImpl):
-            root_src, mainloop = root_to_src(obj)
-            src += root_src
-        elif isinstance(obj, GUIObj.TkCanvasImpl):
-            src += canvas_to_src(obj, associated_vars)
-    src += mainloop
-    # indent all the widget code
-    lines = src.splitlines()
-    src = ""
-    for line in lines:
-        src += (" " * 4) + line + "\n"
-    _globals = "\n    global "
-    for obj in gui_objects:
-        _globals += obj.name + ", "
-    _globals = _globals[0:-2] + "\n"
-    # add user code and helper methods
-    src = (code_editor["text"] + helper_code + "\n" + "def initialize():" +
-		   _globals + src + "initialize()\n")
-    return src
-
-
-def label_to_src(label):
-    """returns a string of the generated src for the label"""
-    n = label.name
-    posx = str(label.position.x)
-    posy = str(label.position.y)
-    sizex = str(label.size.x)
-    sizey = str(label.size.y)
-    text = label.text
-    parent = label.parent.name
-
-    src = ("""%(n)s = Label(%(parent)s)
-%(n)s["text"] = "%(text)s"
-%(n)s.place(x=%(posx)s, y=%(posy)s, width=%(sizex)s, height=%(sizey)s)\n\n""" %
-           locals())
-    return src
-
-
-def button_to_src(button):
-    """returns a string of the generated src for the button"""
-    name = button.name
-    posx = str(button.position.x)
-    posy = str(button.position.y)
-    sizex = str(button.size.x)
-    sizey = str(button.size.y)
-    text = button.text
-    parent = button.parent.name
-    command = save_command(button.command)
-
-    src = ""
-    if command:
-        src += ("%(name)s = Button(%(parent)s, command=%(command)s)\n" %
-                locals())
-    else:
-        src += "%(name)s = Button(%(parent)s)\n" % locals()
-    src += '%(name)s["text"] = "%(text)s"\n' % locals()
-    src += '%(name)s.place(x=%(posx)s, y=%(posy)s, width=%(sizex)s,' % locals()
-    src += ' height=%(sizey)s)\n\n' % locals()
-    return src
-
-
-def entry_to_src(entry, associated_vars):
-    """
-    returns a string of the generated src for the entry.
-    associated_vars is a list of already generated associated variables
-    """
-    name = entry.name
-    posx = str(entry.position.x)
-    posy = str(entry.position.y)
-    sizex = str(entry.size.x)
-    sizey = str(entry.size.y)
-    text = entry.text
-    parent = entry.parent.name
-    justify = entry.justify
-    show = entry.show
-    associated_variable = entry.associated_variable
-    validate = entry.validate
-    validate_command = save_command(entry.validate_command)
-    src = ""
-
-    if associated_variable and associated_variable not in associated_vars:
-        src += "%(associated_variable)s = StringVar()\n\n" % locals()
-        associated_vars.append(associated_variable)
-    src += """%(name)s = Entry(%(parent)s)
-%(name)s.insert(0, "%(text)s")\n""" % locals()
-    if associated_variable:
-        src += ('%(name)s["textvariable"] = %(associated_variable)s\n'
-                % locals())
-    if justify:
-        src += '%(name)s["justify"] = "%(justify)s"\n' % locals()
-    if show:
-        src += '%(name)s["show"] = "%(show)s"\n' % locals()
-    if validate:
-        src += '%(name)s["validate"] = "%(validate)s"\n' % locals()
-    if validate_command:
-        src += ('%(name)s["validatecommand"] = %(validate_command)s\n'
-                % locals())
-    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
-    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
-    return src
-
-
-def text_to_src(text):
-    """
-    returns the string of the generated src for the text
-    """
-    name = text.name
-    posx = str(text.position.x)
-    posy = str(text.position.y)
-    sizex = str(text.size.x)
-    sizey = str(text.size.y)
-    parent = text.parent.name
-    src = ""
-    src += '%(name)s = Text(%(parent)s)\n' % locals()
-    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
-    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
-    return src
-
-
-def canvas_to_src(canvas, associated_vars):
-    """
-    returns the string of the generated src for the entry.
-    associated_vars in a list of already generated associated variables
-    """
-    name = canvas.name
-    posx = str(canvas.position.x)
-    posy = str(canvas.position.y)
-    sizex = str(canvas.size.x)
-    sizey = str(canvas.size.y)
-    parent = canvas.parent.name
-    bg = canvas.bg
-    src = ""
-    src += '%(name)s = Canvas(%(parent)s, bg="%(bg)s")\n' % locals()
-    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
-    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
-    return src
-
-
-def checkbutton_to_src(checkbutton, associated_vars):
-    """
-    returns the string of the generated src for the entry.
-    associated_vars in a list of already generated associated variables
-    """
-    name = checkbutton.name
-    posx = str(checkbutton.position.x)
-    posy = str(checkbutton.position.y)
-    sizex = str(checkbutton.size.x)
-    sizey = str(checkbutton.size.y)
-    text = checkbutton.text
-    parent = checkbutton.parent.name
-    command = checkbutton.command
-    offvalue = checkbutton.offvalue
-    onvalue = checkbutton.onvalue
-    takefocus = checkbutton.takefocus
-    variable = checkbutton.variable
-    # to know if we should use StringVar or IntVar
-    isnumeric = onvalue.isnumeric() and offvalue.isnumeric()
-    src = ""
-
-    if variable and variable not in associated_vars:
-        if isnumeric:
-            src += "%(variable)s = IntVar()\n" % locals()
-        else:
-            src += "%(variable)s = StringVar()\n" % locals()
-        associated_vars.append(variable)
-    if command:
-        src += '%(name)s = Checkbutton(%(parent)s, ' % locals()
-        src += 'command=%(command)s)\n' % locals()
-    else:
-        src += '%(name)s = Checkbutton(%(parent)s)\n' % locals()
-    src += '%(name)s["text"] = "%(text)s"\n' % locals()
-    if variable:
-        src += '%(name)s["variable"] = %(variable)s\n' % locals()
-    if onvalue:
-        if isnumeric:
-            src += '%(name)s["onvalue"] = %(onvalue)s\n' % locals()
-        else:
-            src += '%(name)s["onvalue"] = "%(onvalue)s"\n' % locals()
-    if offvalue:
-        if isnumeric:
-            src += '%(name)s["offvalue"] = %(offvalue)s\n' % locals()
-        else:
-            src += '%(name)s["offvalue"] = "%(offvalue)s"\n' % locals()
-    if takefocus:
-        src += '%(name)s["takefocus"] = %(takefocus)s\n' % locals()
-    src += "%(name)s.place(x=%(posx)s, y=%(posy)s, " % locals()
-    src += "width=%(sizex)s, height=%(sizey)s)\n\n" % locals()
-    return src
-
-
-def root_to_src(_root):
-    """
-    returns a tuple
-    tuple[0] is src to create window
-    tuple[1] is src to start mainloop
-    the mainloop src should be added after all other widgets are added to src
-    """
-    name = _root.name
-    title = _root.title
-    sizex = str(_root.size.x)
-    sizey = str(_root.size.y)
-    geometry = sizex + "x" + sizey
-
-    src = """
-%(name)s = Tk()
-%(name)s.title("%(title)s")
-%(name)s.geometry("%(geometry)s")\n\n""" % locals()
-    mainloop = "%(name)s.mainloop()" % locals()
-    return src, mainloop
-
-
-initialize()
+    """returns the source of the whole file being designed"""
+    return guicore.gui_to_src(gui_objects, code_editor["text"])
+
+
+# The order of these determines the position of the properties in the panel
+widget_types.registry.register_properties(
+    GUIObj.GUIObj, load_guiobj_properties, save_guiobj_properties)
+widget_types.registry.register_properties(
+    GUIObj.Widget, load_widget_properties, save_widget_properties)
+widget_types.registry.register_properties(
+    GUIObj.MovableWidget, load_movable_properties, save_movable_properties)
+widget_types.registry.register_properties(
+    GUIObj.Sized, load_sizable_properties, save_sizable_properties)
+widget_types.registry.register_properties(
+    GUIObj.TextContainer, load_textcontainer_properties,
+    save_textcontainer_properties)
+widget_types.registry.register_properties(
+    GUIObj.Entry, load_entry_properties, save_entry_properties)
+widget_types.registry.register_properties(
+    GUIObj.Button, load_button_properties, save_button_properties)
+widget_types.registry.register_properties(
+    GUIObj.Checkbutton, load_checkbutton_properties,
+    save_checkbutton_properties)
+widget_types.registry.register_properties(
+    GUIObj.Text, load_text_properties, save_text_properties)
+widget_types.registry.register_properties(
+    GUIObj.Canvas, load_canvas_properties, save_canvas_properties)
+widget_types.registry.register_properties(
+    GUIObj.Window, load_window_properties, save_window_properties)
+
+
+if __name__ == "__main__":
+    initialize()
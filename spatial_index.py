@@ -0,0 +1,130 @@
+"""
+    spatial_index.py
+
+    This file contains GridIndex, a spatial index over rectangles. The plane is
+    split into square cells and every rectangle is stored in each cell it
+    touches. Finding what is under a point or inside a selection box only has
+    to look at the rectangles in the cells the query touches, instead of every
+    rectangle on the canvas.
+"""
+
+
+class GridIndex:
+    """
+    A uniform grid of rectangles. Each rectangle is stored with a key, which is
+    what queries return. Keys must be hashable.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}  # k -> (column, row), v -> set of keys
+        self._rects = {}  # k -> key, v -> (x0, y0, x1, y1)
+
+    def _cells_for(self, x0, y0, x1, y1):
+        """returns the (column, row) of every cell the rectangle touches"""
+        size = self.cell_size
+        columns = range(int(x0 // size), int(x1 // size) + 1)
+        rows = range(int(y0 // size), int(y1 // size) + 1)
+        return [(column, row) for column in columns for row in rows]
+
+    def insert(self, key, x0, y0, x1, y1):
+        """adds the rectangle for the key. Replaces the key's old rectangle"""
+        if key in self._rects:
+            self.remove(key)
+        rect = (min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        self._rects[key] = rect
+        for cell in self._cells_for(*rect):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key):
+        """removes the key's rectangle. Does nothing if the key is not in the index"""
+        rect = self._rects.pop(key, None)
+        if rect is None:
+            return
+        for cell in self._cells_for(*rect):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def get_rect(self, key):
+        """returns the (x0, y0, x1, y1) rectangle of the key"""
+        return self._rects[key]
+
+    def query_point(self, x, y):
+        """returns a list of keys whose rectangle contains the point"""
+        size = self.cell_size
+        keys = self._cells.get((int(x // size), int(y // size)), ())
+        result = []
+        for key in keys:
+            x0, y0, x1, y1 = self._rects[key]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                result.append(key)
+        return result
+
+    def query_rect(self, x0, y0, x1, y1):
+        """returns a set of keys whose rectangle overlaps the given rectangle"""
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        result = set()
+        for cell in self._cells_for(x0, y0, x1, y1):
+            for key in self._cells.get(cell, ()):
+                if key in result:
+                    continue
+                kx0, ky0, kx1, ky1 = self._rects[key]
+                if kx0 <= x1 and x0 <= kx1 and ky0 <= y1 and y0 <= ky1:
+                    result.add(key)
+        return result
+
+    def clear(self):
+        """removes every rectangle"""
+        self._cells.clear()
+        self._rects.clear()
+
+    def __contains__(self, key):
+        return key in self._rects
+
+    def __len__(self):
+        return len(self._rects)
+
+
+if __name__ == "__main__":
+    # Test code
+    import random
+    import timeit
+
+    index = GridIndex()
+    random.seed(0)
+    rects = {}
+    for i in range(5000):
+        x = random.randrange(0, 2000)
+        y = random.randrange(0, 2000)
+        rects[i] = (x, y, x + random.randrange(10, 120),
+                    y + random.randrange(10, 60))
+        index.insert(i, *rects[i])
+
+    # check the index against a plain search
+    for i in range(200):
+        x = random.randrange(0, 2000)
+        y = random.randrange(0, 2000)
+        expected = set(key for key, (x0, y0, x1, y1) in rects.items()
+                       if x0 <= x <= x1 and y0 <= y <= y1)
+        assert set(index.query_point(x, y)) == expected
+    box = (500, 500, 900, 700)
+    expected = set(key for key, (x0, y0, x1, y1) in rects.items()
+                   if x0 <= box[2] and box[0] <= x1 and
+                   y0 <= box[3] and box[1] <= y1)
+    assert index.query_rect(*box) == expected
+
+    number = 1000
+    point_time = timeit.timeit(lambda: index.query_point(1000, 1000),
+                               number=number)
+    scan_time = timeit.timeit(
+        lambda: [key for key, (x0, y0, x1, y1) in rects.items()
+                 if x0 <= 1000 <= x1 and y0 <= 1000 <= y1],
+        number=number)
+    print("%d rectangles" % len(index))
+    print("query_point: %.4f ms, plain search: %.4f ms" %
+          (point_time / number * 1000, scan_time / number * 1000))
+    move_time = timeit.timeit(lambda: index.insert(0, 10, 10, 60, 40),
+                              number=number)
+    print("moving one rectangle: %.4f ms" % (move_time / number * 1000))
@@ -0,0 +1,88 @@
+"""
+    text_buffer.py
+
+    This file contains TextBuffer, a copy of a text widget's contents kept as
+    a list of lines. The code editor updates it with every insert, delete
+    and replace, so reading lines or the whole text does not have to ask tk
+    for a copy of the buffer. Every edit increments the version, so a reader
+    that keeps the version it last saw can tell if anything changed without
+    reading the text.
+"""
+
+
+class TextBuffer:
+    """
+    Lines of text, without their newlines. Lines and columns are 0-based.
+
+    Listeners bound with bind() are called with (first, last, count) after
+    lines first up to (not including) last were replaced with count lines.
+    """
+    def __init__(self, text=""):
+        self.lines = text.split("\n")
+        self.version = 0
+        self._listeners = []
+        self._text = None  # the joined lines, made by get_text()
+        self._text_version = None  # the version _text was made at
+
+    def bind(self, listener):
+        """calls listener(first, last, count) after every change"""
+        self._listeners.append(listener)
+
+    def replace_lines(self, first, last, new_lines):
+        """replaces lines first up to (not including) last with new_lines"""
+        # the list is changed in place because it may be shared
+        self.lines[first:last] = new_lines
+        self.version += 1
+        for listener in self._listeners:
+            listener(first, last, len(new_lines))
+
+    def insert(self, line, column, chars):
+        """inserts chars at the given line and column"""
+        text = self.lines[line]
+        new_text = text[:column] + chars + text[column:]
+        self.replace_lines(line, line + 1, new_text.split("\n"))
+
+    def delete(self, first_line, first_column, last_line, last_column):
+        """deletes the text from the first line and column up to (not including) the last line and column"""
+        new_text = (self.lines[first_line][:first_column] +
+                    self.lines[last_line][last_column:])
+        self.replace_lines(first_line, last_line + 1, [new_text])
+
+    def set_text(self, text):
+        """replaces all of the text"""
+        self.replace_lines(0, len(self.lines), text.split("\n"))
+
+    def get_line(self, index):
+        return self.lines[index]
+
+    def get_lines(self, first, last):
+        """returns a list of lines first up to (not including) last"""
+        return self.lines[first:last]
+
+    def line_count(self):
+        return len(self.lines)
+
+    def get_text(self):
+        """returns all of the text. It is only joined again after a change"""
+        if self._text_version != self.version:
+            self._text = "\n".join(self.lines)
+            self._text_version = self.version
+        return self._text
+
+
+if __name__ == "__main__":
+    # Test code
+    buffer = TextBuffer("def foo():\n    pass")
+    changes = []
+    buffer.bind(lambda first, last, count: changes.append((first, last, count)))
+    version = buffer.version
+    buffer.insert(1, 8, "\n    return 1")
+    assert buffer.lines == ["def foo():", "    pass", "    return 1"]
+    assert changes == [(1, 2, 2)]
+    assert buffer.version != version
+    text = buffer.get_text()
+    assert buffer.get_text() is text  # not joined again without a change
+    buffer.delete(0, 7, 2, 4)
+    assert buffer.get_text() == "def fooreturn 1"
+    assert buffer.get_lines(0, 5) == ["def fooreturn 1"]
+    print("ok")
@@ -0,0 +1,72 @@
+"""
+    widget_registry.py
+
+    This file contains the WidgetRegistry, which keeps track of every gui
+    object in the designer. Objects are stored by name so they can be looked up
+    without searching, and in the order they were added so code can be
+    generated in the same order every time.
+"""
+
+
+class WidgetRegistry:
+    """
+    Holds gui objects by name. Adding, removing, renaming and looking up an
+    object are all O(1). Iterating gives the objects in the order they were
+    added.
+    """
+    def __init__(self):
+        self._by_name = {}  # k -> name, v -> gui object
+        # k -> id of the gui object, v -> gui object
+        # dicts keep insertion order, so this is the ordered storage
+        self._objects = {}
+
+    def add(self, obj):
+        """adds the gui object. Raises ValueError if the name is already used"""
+        if obj.name in self._by_name:
+            raise ValueError("A gui object named %s already exists" % obj.name)
+        self._by_name[obj.name] = obj
+        self._objects[id(obj)] = obj
+
+    def remove(self, obj):
+        """removes the gui object. Raises KeyError if it was never added"""
+        del self._objects[id(obj)]
+        if self._by_name.get(obj.name) is obj:
+            del self._by_name[obj.name]
+
+    def get(self, name):
+        """returns the gui object with the given name, or None if there is none"""
+        return self._by_name.get(name)
+
+    def rename(self, obj, name):
+        """
+        renames the gui object. Returns True if the object now has the name.
+        Returns False and keeps the old name if another object has the name or
+        the object can't be renamed
+        """
+        old_name = obj.name
+        if name == old_name:
+            return True
+        if name in self._by_name:
+            return False
+        obj.name = name
+        if obj.name != name:
+            # the object ignored the new name. For example the root window
+            return False
+        if self._by_name.get(old_name) is obj:
+            del self._by_name[old_name]
+        self._by_name[name] = obj
+        return True
+
+    def clear(self):
+        """removes all gui objects"""
+        self._by_name.clear()
+        self._objects.clear()
+
+    def __contains__(self, obj):
+        return self._objects.get(id(obj)) is obj
+
+    def __iter__(self):
+        return iter(self._objects.values())
+
+    def __len__(self):
+        return len(self._objects)
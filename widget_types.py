@@ -0,0 +1,119 @@
+"""
+    widget_types.py
+
+    This file contains WidgetTypes, which maps each kind of gui object to the
+    code that handles it: the name of its tk class in the generated source,
+    the function that writes its source, the function that loads it from
+    source, and the functions that show and save its properties in the
+    properties panel.
+
+    Each module registers the functions it defines. Lookups follow the method
+    resolution order of the object's class, so every implementation of a
+    model class (e.g. TtkButtonImpl and ItemButtonImpl for Button) is handled
+    by the model's entry. What a class resolves to is cached, so handling an
+    object costs one dict lookup no matter how many kinds of widget there are.
+"""
+import guimodel
+
+
+class WidgetType:
+    """
+    The code that handles one model class. source_name is the tk class it is
+    created with in the generated source (e.g. "Button").
+
+    emitter(writer, guiobj, associated_vars) writes its source.
+    loader(obj, assignments, method_calls) returns a dict of the keyword
+    arguments to create it with, read from the parsed source.
+    """
+    def __init__(self, model, source_name=None, emitter=None, loader=None):
+        self.model = model
+        self.source_name = source_name
+        self.emitter = emitter
+        self.loader = loader
+
+
+class WidgetTypes:
+    """
+    Holds a WidgetType for each registered model class, and the property
+    functions of the properties panel.
+
+    Property functions are registered for a base class and apply to every
+    gui object that is an instance of it. They are kept in the order they
+    were registered, which is the order the panel shows the properties in.
+    """
+    def __init__(self):
+        self._types = {}  # k -> model class, v -> WidgetType
+        self._by_source_name = {}  # k -> source name, v -> WidgetType
+        # (base class, load function, save function) in panel order
+        self._properties = []
+        # k -> class, v -> (WidgetType or None, load functions, save functions)
+        self._resolved = {}
+
+    def register(self, model, source_name=None, emitter=None, loader=None):
+        """
+        registers the code that handles the model class. Arguments that are
+        None keep what was registered for the model before
+        """
+        widget_type = self._types.get(model)
+        if widget_type is None:
+            widget_type = self._types[model] = WidgetType(model)
+        if source_name is not None:
+            widget_type.source_name = source_name
+            self._by_source_name[source_name] = widget_type
+        if emitter is not None:
+            widget_type.emitter = emitter
+        if loader is not None:
+            widget_type.loader = loader
+        self._resolved.clear()
+        return widget_type
+
+    def register_properties(self, base, load, save):
+        """
+        registers the property functions of every instance of base.
+        load(guiobj, properties) adds its properties to the properties dict.
+        save(guiobj) saves the edited properties to the guiobj
+        """
+        self._properties.append((base, load, save))
+        self._resolved.clear()
+
+    def _resolve(self, cls):
+        resolved = self._resolved.get(cls)
+        if resolved is None:
+            widget_type = None
+            for base in cls.__mro__:
+                if base in self._types:
+                    widget_type = self._types[base]
+                    break
+            applying = [(load, save) for base, load, save in self._properties
+                        if issubclass(cls, base)]
+            resolved = (widget_type,
+                        tuple(load for load, save in applying),
+                        tuple(save for load, save in applying))
+            self._resolved[cls] = resolved
+        return resolved
+
+    def get(self, guiobj):
+        """returns the WidgetType of the gui object, or None"""
+        return self._resolve(type(guiobj))[0]
+
+    def get_by_source_name(self, source_name):
+        """returns the WidgetType created with the named tk class, or None"""
+        return self._by_source_name.get(source_name)
+
+    def property_loaders(self, guiobj):
+        """returns the load functions of the gui object's properties"""
+        return self._resolve(type(guiobj))[1]
+
+    def property_savers(self, guiobj):
+        """returns the save functions of the gui object's properties"""
+        return self._resolve(type(guiobj))[2]
+
+
+registry = WidgetTypes()
+registry.register(guimodel.Window, source_name="Tk")
+registry.register(guimodel.Button, source_name="Button")
+registry.register(guimodel.Label, source_name="Label")
+registry.register(guimodel.Entry, source_name="Entry")
+registry.register(guimodel.Checkbutton, source_name="Checkbutton")
+registry.register(guimodel.Text, source_name="Text")
+registry.register(guimodel.Canvas, source_name="Canvas")